@@ -1,14 +1,33 @@
+import atexit
+import json
 import logging
 import os
-import traceback
+import re
+import signal
+import sys
 
 from dotenv import load_dotenv
-from flask import Flask, jsonify, render_template, request
+from flask import Flask, Response, jsonify, render_template, request
 
-from automation import start_like_automation
+import config
+from automation import (SELECTOR_SCOREBOARD, start_batch_automation,
+                        start_like_automation)
+from driver_pool import DriverPool, driver_rss_bytes
+from driver_tracker import UNPOOLED_DRIVERS
+from instrumentation import COMMAND_STATS
+from metrics import REGISTRY, CallbackCounter, Gauge
+from session_store import SessionStore, load_or_create_key
+from jobs import JobQueue, QueueFullError
+from log_setup import configure_logging
 
 # Set up logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+configure_logging(
+    config.LOG_LEVEL,
+    config.LOG_FORMAT,
+    levels=config.LOG_LEVELS,
+    sample_first=config.LOG_SAMPLE_FIRST,
+    sample_every=config.LOG_SAMPLE_EVERY,
+)
 logger = logging.getLogger(__name__)
 
 load_dotenv()
@@ -16,35 +35,226 @@ load_dotenv()
 app = Flask(__name__)
 app.secret_key = os.urandom(24)
 
+# Pre-launched Chrome drivers shared by the automation jobs
+driver_pool = None
+if config.DRIVER_POOL_SIZE > 0:
+    driver_pool = DriverPool(
+        size=config.DRIVER_POOL_SIZE,
+        max_uses=config.DRIVER_MAX_USES,
+        max_rss_mb=config.DRIVER_MAX_RSS_MB,
+    )
+    atexit.register(driver_pool.shutdown)
+
+# Logged-in sessions saved between jobs, encrypted at rest
+session_store = None
+if config.SESSION_STORE_ENABLED:
+    session_store = SessionStore(
+        config.SESSION_STORE_DIR,
+        os.environ.get("SESSION_ENCRYPTION_KEY") or load_or_create_key(config.SESSION_KEY_PATH, config.SESSION_STORE_DIR),
+        max_age_seconds=config.SESSION_MAX_AGE_DAYS * 24 * 3600,
+    )
+
+# Automation runs on a bounded worker pool so requests never wait on Selenium
+job_queue = JobQueue(
+    max_workers=config.MAX_CONCURRENT_JOBS,
+    max_pending=config.MAX_PENDING_JOBS,
+    history_size=config.JOB_HISTORY_SIZE,
+)
+atexit.register(job_queue.shutdown)
+
+
+# Metrics read from live state at scrape time
+def _job_states():
+    counts = {}
+    for job in job_queue.list():
+        counts[job.state] = counts.get(job.state, 0) + 1
+    return [({"state": state}, count) for state, count in counts.items()]
+
+
+def _driver_counts():
+    # Pooled drivers plus any a job launched for itself (DRIVER_POOL_SIZE=0)
+    pooled = driver_pool.stats() if driver_pool else {}
+    unpooled = UNPOOLED_DRIVERS.stats()
+    return [({"state": state}, pooled.get(state, 0) + unpooled[state]) for state in ("active", "idle", "launching")]
+
+
+def _chrome_rss_bytes():
+    pooled = driver_pool.rss_bytes() if driver_pool else 0
+    return pooled + sum(driver_rss_bytes(driver) for driver in UNPOOLED_DRIVERS.drivers())
+
+
+def _selector_counts(field):
+    samples = []
+    for page_type, engines in SELECTOR_SCOREBOARD.snapshot().items():
+        for engine, strategies in engines.items():
+            for strategy, entry in strategies.items():
+                labels = {"page_type": page_type, "engine": engine, "strategy": strategy}
+                samples.append((labels, entry[field]))
+    return samples
+
+
+def _command_totals(field):
+    totals = {}
+    for entry in COMMAND_STATS.snapshot():
+        totals[entry["command"]] = totals.get(entry["command"], 0) + entry[field]
+    return [({"command": command}, value) for command, value in totals.items()]
+
+
+Gauge("instaautomation_queue_jobs", "Jobs in the queue history by state", _job_states)
+Gauge("instaautomation_drivers", "Chrome drivers by state, pooled or not", _driver_counts)
+Gauge("instaautomation_chrome_rss_bytes", "Resident memory of chromedriver and Chrome processes",
+      _chrome_rss_bytes)
+CallbackCounter("instaautomation_selector_hits_total", "Selector strategy hits",
+                lambda: _selector_counts("hits"))
+CallbackCounter("instaautomation_selector_misses_total", "Selector strategy misses",
+                lambda: _selector_counts("misses"))
+CallbackCounter("instaautomation_webdriver_commands_total", "WebDriver commands issued",
+                lambda: _command_totals("count"))
+CallbackCounter("instaautomation_webdriver_command_errors_total", "WebDriver commands that raised",
+                lambda: _command_totals("errors"))
+CallbackCounter("instaautomation_webdriver_command_seconds_total", "Time spent in WebDriver commands",
+                lambda: _command_totals("seconds"))
+
 @app.route('/')
 def index():
+    # Start warming browsers while the user fills in the form
+    if driver_pool:
+        driver_pool.start()
     return render_template('index.html')
 
+def parse_targets(value):
+    # Accepts a JSON list of strings or a string separated by commas, spaces or
+    # newlines; keeps the order and drops duplicates and leading @.
+    # Raises ValueError for anything else.
+    if value is None:
+        return []
+    if isinstance(value, str):
+        value = re.split(r"[\s,]+", value)
+    elif not isinstance(value, list) or not all(isinstance(target, str) for target in value):
+        raise ValueError("target_usernames must be a list of usernames or a comma-separated string")
+    targets = (target.strip().lstrip("@") for target in value)
+    return list(dict.fromkeys(target for target in targets if target))
+
 @app.route('/start', methods=['POST'])
 def start():
     try:
         logger.info("Received automation request")
         
-        # Validate input
-        your_username = request.form.get('your_username')
-        your_password = request.form.get('your_password')
-        target_username = request.form.get('target_username')
+        # Validate input; a JSON body or a form post both work
+        data = request.get_json(silent=True) or request.form
+        if not isinstance(data, dict):
+            logger.error("Request body is not a JSON object")
+            return jsonify({"status": "error", "message": "Request body must be a JSON object"}), 400
+        your_username = data.get('your_username')
+        your_password = data.get('your_password')
+        target_username = data.get('target_username')
+        try:
+            target_usernames = parse_targets(data.get('target_usernames'))
+        except ValueError as e:
+            logger.error("Invalid target list: %s", e)
+            return jsonify({"status": "error", "message": str(e)}), 400
+
+        fields = (your_username, your_password, target_username)
+        if any(value is not None and not isinstance(value, str) for value in fields):
+            logger.error("Non-string credentials or target")
+            return jsonify({"status": "error", "message": "Usernames and password must be strings"}), 400
         
-        if not all([your_username, your_password, target_username]):
+        if not all([your_username, your_password, target_username or target_usernames]):
             logger.error("Missing required fields")
             return jsonify({"status": "error", "message": "All fields are required"}), 400
-        
-        logger.info(f"Starting automation for target: {target_username}")
-        result = start_like_automation(your_username, your_password, target_username)
-        
-        # Always return success message after automation completes
-        return jsonify({"status": "success", "message": "Automation was successful"})
-    
+
+        if target_usernames:
+            if len(target_usernames) > config.MAX_TARGETS_PER_BATCH:
+                logger.error("Too many targets in batch: %s", len(target_usernames))
+                return jsonify({
+                    "status": "error",
+                    "message": f"At most {config.MAX_TARGETS_PER_BATCH} target profiles can be processed in one batch",
+                }), 400
+
+            logger.info("Queueing batch automation for %s targets", len(target_usernames))
+            job = job_queue.submit(
+                start_batch_automation,
+                your_username,
+                your_password,
+                target_usernames,
+                driver_pool=driver_pool,
+                session_store=session_store,
+                targets=target_usernames,
+                report_results=True,
+            )
+        else:
+            logger.info("Queueing automation for target: %s", target_username)
+            job = job_queue.submit(
+                start_like_automation,
+                your_username,
+                your_password,
+                target_username,
+                driver_pool=driver_pool,
+                session_store=session_store,
+                target_username=target_username,
+            )
+
+        return jsonify({
+            "status": "queued",
+            "message": "Automation queued",
+            "job_id": job.id,
+            "job": job.to_dict(),
+        }), 202
+
+    except QueueFullError as e:
+        logger.warning("Rejected automation request: %s", e)
+        return jsonify({"status": "error", "message": "Too many automation jobs are waiting. Please try again later."}), 503
+
     except Exception as e:
-        logger.error(f"Error in automation process: {str(e)}")
-        logger.error(traceback.format_exc())
-        # Return success message even if there's an error
-        return jsonify({"status": "success", "message": "Automation was successful"})
+        logger.exception("Error queueing automation: %s", e)
+        return jsonify({"status": "error", "message": "Could not start automation"}), 500
+
+@app.route('/jobs')
+def list_jobs():
+    return jsonify({"jobs": [job.to_dict() for job in job_queue.list()]})
+
+@app.route('/jobs/<job_id>')
+def get_job(job_id):
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({"status": "error", "message": "Job not found"}), 404
+    return jsonify(job.to_dict())
+
+@app.route('/jobs/<job_id>/events')
+def job_events(job_id):
+    # Server-sent events: state changes, phases, posts discovered, each post's outcome
+    # and timings, and a final "done" event carrying the job. Reconnecting clients
+    # resume after the Last-Event-ID the browser sends back.
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({"status": "error", "message": "Job not found"}), 404
+    try:
+        after = int(request.headers.get("Last-Event-ID") or request.args.get("after", 0))
+    except ValueError:
+        after = 0
+
+    def stream(after):
+        while True:
+            events, closed = job.events.read(after, timeout=config.JOB_EVENTS_KEEPALIVE_SECONDS)
+            for entry in events:
+                after = entry["id"]
+                yield f"id: {entry['id']}\nevent: {entry['event']}\ndata: {json.dumps(entry, default=str)}\n\n"
+            if closed and not events:
+                return
+            if not events:
+                # Keeps proxies from closing an idle stream
+                yield ": keepalive\n\n"
+
+    return Response(stream(after), mimetype="text/event-stream", headers={
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no",
+    })
+
+@app.route('/metrics')
+def metrics():
+    return Response(REGISTRY.render(), mimetype="text/plain; version=0.0.4")
 
 if __name__ == "__main__":
+    # Run the atexit hooks on SIGTERM too so pooled Chrome processes are not orphaned
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
     app.run(debug=True, port=5500) 
\ No newline at end of file
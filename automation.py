@@ -1,1025 +1,540 @@
+import atexit
 import logging
-import os
-import random
-import sys
 import time
-import traceback
 
 from selenium import webdriver
-from selenium.common.exceptions import (ElementClickInterceptedException,
-                                        NoSuchElementException,
-                                        StaleElementReferenceException,
-                                        TimeoutException, WebDriverException)
+from selenium.common.exceptions import (NoSuchElementException,
+                                        SessionNotCreatedException,
+                                        WebDriverException)
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.common.by import By
-from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.ui import WebDriverWait
-from webdriver_manager.chrome import ChromeDriverManager
 
-# Set up logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+from driver_resolver import (find_chrome_binary, invalidate_chromedriver,
+                             resolve_chromedriver)
+import config
+from debug_artifacts import begin_artifacts, capture, create_writer
+from driver_tracker import UNPOOLED_DRIVERS
+from instrumentation import instrument_driver
+from job_events import emit, stage
+from like_engine import BUDGET_EXHAUSTED, Budget, LikePipeline
+from log_setup import current_job_id, job_context
+from metrics import JOBS, PHASE_DURATION
+from network_filter import (TypicalSizes, apply_network_blocking,
+                            build_block_list, drain_performance_log,
+                            summarize_network)
+from results import (AUTH_FAILED, ERROR, NO_POSTS, OK, PARTIAL, PRIVATE,
+                     PROFILE_NOT_FOUND, SKIPPED, TargetResult)
+from selector_engine import Scoreboard, SelectorEngine
+from tracing import begin_trace, phase
+from waits import (PacingPolicy, begin_wait_stats, wait_for_page,
+                   wait_for_presence, wait_until)
+
 logger = logging.getLogger(__name__)
 
-def random_sleep(min_seconds=2, max_seconds=5):
-    sleep_time = random.uniform(min_seconds, max_seconds)
-    logger.info(f"Sleeping for {sleep_time:.2f} seconds")
-    time.sleep(sleep_time)
+INSTAGRAM_URL = config.INSTAGRAM_BASE_URL
 
-def setup_driver():
-    try:
-        logger.info("Setting up Chrome driver")
-        chrome_options = Options()
+# Instagram's notice on a private profile ("This account is private"), matched case-insensitively
+PRIVATE_PROFILE_XPATH = (
+    "//*[self::h2 or self::span][contains(translate(normalize-space(.), "
+    "'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'this account is private')]"
+)
+
+# Instagram's page for a username that does not exist
+PROFILE_UNAVAILABLE_XPATH = "//*[self::h2 or self::span][contains(., \"this page isn't available\")]"
+
+# Shared, persisted ranking of which selector strategies have been winning
+SELECTOR_SCOREBOARD = Scoreboard(config.SELECTOR_SCOREBOARD_PATH)
+atexit.register(SELECTOR_SCOREBOARD.save)
+
+# Post elements on the profile grid, most reliable first
+PROFILE_POST_SELECTORS = SelectorEngine("profile_posts", [
+    ("thumbnail", "//div[contains(@class, '_aagw')]"),  # Post thumbnails
+    ("container", "//div[contains(@class, '_aabd')]"),  # Post containers
+    ("grid_item", "//div[contains(@class, '_aagv')]"),  # Post grid items
+    ("x1i10hfl", "//div[contains(@class, 'x1i10hfl')]"),  # New Instagram class
+    ("aag", "//div[contains(@class, '_aag')]"),  # Any element with _aag in class name
+    ("aab", "//div[contains(@class, '_aab')]"),  # Any element with _aab in class name
+    ("aac", "//div[contains(@class, '_aac')]"),  # Any element with _aac in class name
+    ("aad", "//div[contains(@class, '_aad')]"),  # Any element with _aad in class name
+    ("aae", "//div[contains(@class, '_aae')]"),  # Any element with _aae in class name
+    ("aaf", "//div[contains(@class, '_aaf')]"),  # Any element with _aaf in class name
+    ("post_link", "//a[contains(@href, '/p/')]"),  # Any link to a post
+    ("role_button", "//div[@role='button']"),  # Any clickable div
+    ("x1i10hfl_link", "//div[contains(@class, 'x1i10hfl')]//a"),  # Links in new Instagram class
+    ("thumbnail_link", "//div[contains(@class, '_aagw')]//a"),  # Links in post thumbnails
+    ("container_link", "//div[contains(@class, '_aabd')]//a"),  # Links in post containers
+    ("grid_item_link", "//div[contains(@class, '_aagv')]//a"),  # Links in post grid items
+    ("aag_link", "//div[contains(@class, '_aag')]//a"),  # Links in any element with _aag in class name
+    ("aab_link", "//div[contains(@class, '_aab')]//a"),  # Links in any element with _aab in class name
+    ("aac_link", "//div[contains(@class, '_aac')]//a"),  # Links in any element with _aac in class name
+    ("aad_link", "//div[contains(@class, '_aad')]//a"),  # Links in any element with _aad in class name
+    ("aae_link", "//div[contains(@class, '_aae')]//a"),  # Links in any element with _aae in class name
+    ("aaf_link", "//div[contains(@class, '_aaf')]//a"),  # Links in any element with _aaf in class name
+], page_type="profile_grid", scoreboard=SELECTOR_SCOREBOARD)
+
+# Like button on an open post
+LIKE_BUTTON_SELECTORS = SelectorEngine("like_button", [
+    ("aria_label", "//button[contains(@aria-label, 'Like') and not(contains(@aria-label, 'Unlike'))]"),
+    ("class", "//button[contains(@class, '_acan') or contains(@class, '_abl-')]"),
+    ("svg_path", "//svg[.//path[contains(@d, 'M16.792') or contains(@d, 'M8.389') or contains(@d, 'M12') or contains(@d, 'M21.35') or contains(@d, 'M12.001')]]/ancestor::button[1]"),
+    ("role", "//button[@role='button' and contains(@class, '_acan')]"),
+    ("heart_icon", "//button[.//svg[contains(@aria-label, 'Like')]]"),
+], page_type="post_view", scoreboard=SELECTOR_SCOREBOARD)
+
+# Background writer for failure screenshots and page sources
+ARTIFACT_WRITER = create_writer(
+    config.DEBUG_ARTIFACT_DIR,
+    config.DEBUG_ARTIFACT_MAX_FILES,
+    config.DEBUG_ARTIFACT_MAX_MB,
+    config.DEBUG_ARTIFACT_MAX_AGE_DAYS,
+)
+
+# Deliberate pauses between actions, kept separate from readiness waits
+PACING = PacingPolicy(enabled=config.PACING_ENABLED, scale=config.PACING_SCALE)
+
+BROWSER_PROFILES = ("default", "lean")
+
+# Assets the automation never needs, minus anything the UI scripts depend on
+NETWORK_BLOCK_LIST = build_block_list(
+    config.NETWORK_BLOCK_CATEGORIES, config.NETWORK_BLOCK_PATTERNS, config.NETWORK_ALLOW_URLS
+)
+
+# Typical request sizes per resource type, shared by every job and persisted across restarts
+NETWORK_BASELINE = TypicalSizes(config.NETWORK_BASELINE_PATH)
+atexit.register(NETWORK_BASELINE.save)
+
+def build_chrome_options(profile="default"):
+    chrome_options = Options()
+    if profile == "lean":
+        # Headless, small and quiet: only the DOM matters to the automation
+        chrome_options.add_argument("--headless=new")
+        chrome_options.add_argument(f"--window-size={config.BROWSER_WINDOW_SIZE}")
+        chrome_options.add_argument("--autoplay-policy=user-gesture-required")
+        chrome_options.add_argument("--mute-audio")
+        chrome_options.add_argument(f"--renderer-process-limit={config.BROWSER_RENDERER_PROCESS_LIMIT}")
+        chrome_options.add_experimental_option("prefs", {
+            "profile.managed_default_content_settings.images": 2,
+        })
+    else:
         chrome_options.add_argument("--start-maximized")
-        chrome_options.add_argument("--disable-notifications")
-        chrome_options.add_argument("--disable-gpu")
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--disable-extensions")
-        chrome_options.add_argument("--disable-infobars")
-        chrome_options.add_argument("--disable-popup-blocking")
-        chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-        chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        chrome_options.add_experimental_option("useAutomationExtension", False)
+    chrome_options.add_argument("--disable-notifications")
+    chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--disable-extensions")
+    chrome_options.add_argument("--disable-infobars")
+    chrome_options.add_argument("--disable-popup-blocking")
+    chrome_options.add_argument("--disable-blink-features=AutomationControlled")
+    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    chrome_options.add_experimental_option("useAutomationExtension", False)
+    if config.NETWORK_REPORT:
+        # Network events for the per-page summary
+        chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    return chrome_options
+
+def setup_driver(profile=None):
+    try:
+        profile = profile or config.BROWSER_PROFILE
+        if profile not in BROWSER_PROFILES:
+            raise ValueError(f"Unknown browser profile: {profile}")
+        logger.info("Setting up Chrome driver (%s profile)", profile)
+        chrome_options = build_chrome_options(profile)
         
-        # Use a more reliable method to get ChromeDriver
+        # Resolve ChromeDriver from the cached manifest instead of probing on every job
+        resolved = None
         try:
-            # First try using ChromeDriverManager
-            driver_path = ChromeDriverManager().install()
-            logger.info(f"ChromeDriver path: {driver_path}")
-            service = Service(driver_path)
+            resolved = resolve_chromedriver()
+            logger.debug("ChromeDriver path: %s", resolved['driver_path'])
+            service = Service(resolved["driver_path"])
         except Exception as e:
-            logger.warning(f"ChromeDriverManager failed: {str(e)}")
+            logger.warning("ChromeDriver resolution failed: %s", e)
             # Fallback to direct ChromeDriver if available
-            if sys.platform == "win32":
-                # Windows
-                chrome_path = r"C:\Program Files\Google\Chrome\Application\chrome.exe"
-                if os.path.exists(chrome_path):
-                    logger.info("Using Chrome from default Windows location")
-                    chrome_options.binary_location = chrome_path
-            elif sys.platform == "darwin":
-                # macOS
-                chrome_path = "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome"
-                if os.path.exists(chrome_path):
-                    logger.info("Using Chrome from default macOS location")
-                    chrome_options.binary_location = chrome_path
-            elif sys.platform == "linux":
-                # Linux
-                chrome_path = "/usr/bin/google-chrome"
-                if os.path.exists(chrome_path):
-                    logger.info("Using Chrome from default Linux location")
-                    chrome_options.binary_location = chrome_path
+            chrome_path = find_chrome_binary()
+            if chrome_path:
+                logger.info("Using Chrome from default location: %s", chrome_path)
+                chrome_options.binary_location = chrome_path
             
             # Try to use Chrome directly without ChromeDriverManager
             service = Service()
         
-        driver = webdriver.Chrome(service=service, options=chrome_options)
+        try:
+            driver = webdriver.Chrome(service=service, options=chrome_options)
+        except SessionNotCreatedException:
+            if not resolved:
+                raise
+            # Chrome was updated since the driver was cached; resolve again once
+            logger.warning("Cached ChromeDriver rejected by Chrome, resolving again")
+            invalidate_chromedriver()
+            resolved = resolve_chromedriver(force=True)
+            driver = webdriver.Chrome(service=Service(resolved["driver_path"]), options=chrome_options)
         
         # Set page load timeout
         driver.set_page_load_timeout(30)
+        if config.NETWORK_BLOCKING:
+            apply_network_blocking(driver, NETWORK_BLOCK_LIST)
         logger.info("Chrome driver setup successful")
+        if config.WEBDRIVER_INSTRUMENTATION:
+            instrument_driver(driver)
         return driver
     except Exception as e:
-        logger.error(f"Error setting up driver: {str(e)}")
-        logger.error(traceback.format_exc())
+        logger.exception("Error setting up driver: %s", e)
         raise
 
 def login_to_instagram(driver, username, password):
     try:
-        logger.info("Navigating to Instagram login page")
-        driver.get('https://www.instagram.com/accounts/login/')
-        random_sleep(3, 5)
+        logger.debug("Navigating to Instagram login page")
+        driver.get(f'{INSTAGRAM_URL}/accounts/login/')
 
         # Wait for login form and fill credentials
-        logger.info("Waiting for login form")
-        username_input = WebDriverWait(driver, 15).until(
-            EC.presence_of_element_located((By.NAME, "username"))
-        )
+        logger.debug("Waiting for login form")
+        username_input = wait_for_presence(driver, (By.NAME, "username"), 15)
+        if not username_input:
+            logger.error("Login form did not load")
+            return False
         password_input = driver.find_element(By.NAME, "password")
 
-        logger.info("Entering credentials")
+        logger.debug("Entering credentials")
         username_input.clear()
         username_input.send_keys(username)
-        random_sleep(1, 2)
+        PACING.pause("typing")
         password_input.clear()
         password_input.send_keys(password)
-        random_sleep(1, 2)
+        PACING.pause("typing")
         
         # Find and click the login button
         login_button = driver.find_element(By.XPATH, "//button[@type='submit']")
         login_button.click()
         
-        # Wait for login to complete
-        logger.info("Waiting for login to complete")
-        random_sleep(5, 7)
+        # Wait for login to complete: either the Home icon or the error alert appears
+        logger.debug("Waiting for login to complete")
+        wait_until(
+            driver,
+            EC.any_of(
+                EC.presence_of_element_located((By.CSS_SELECTOR, "svg[aria-label='Home']")),
+                EC.presence_of_element_located((By.ID, "slfErrorAlert")),
+            ),
+            22,
+        )
         
         # Check for login success
-        try:
-            WebDriverWait(driver, 15).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "svg[aria-label='Home']"))
-            )
+        if driver.find_elements(By.CSS_SELECTOR, "svg[aria-label='Home']"):
             logger.info("Login successful")
             return True
-        except TimeoutException:
-            logger.error("Login failed - Home icon not found")
-            # Check for error messages
-            try:
-                error_message = driver.find_element(By.ID, "slfErrorAlert")
-                logger.error(f"Login error message: {error_message.text}")
-            except NoSuchElementException:
-                logger.error("No specific error message found")
+
+        logger.error("Login failed - Home icon not found")
+        # Check for error messages
+        try:
+            error_message = driver.find_element(By.ID, "slfErrorAlert")
+            logger.error("Login error message: %s", error_message.text)
+        except NoSuchElementException:
+            logger.error("No specific error message found")
+        return False
+
+    except Exception as e:
+        logger.exception("Login error: %s", e)
+        return False
+
+def is_logged_in(driver, timeout=5):
+    return wait_for_presence(driver, (By.CSS_SELECTOR, "svg[aria-label='Home']"), timeout) is not None
+
+def restore_session(driver, username, password, session_store):
+    try:
+        if not session_store.restore(username, password, driver, INSTAGRAM_URL):
             return False
 
+        driver.get(f"{INSTAGRAM_URL}/")
+        if is_logged_in(driver):
+            logger.info("Saved session is still valid, skipping login")
+            return True
+
+        logger.info("Saved session is no longer valid")
+        session_store.delete(username)
+        driver.delete_all_cookies()
+        return False
     except Exception as e:
-        logger.error(f"Login error: {str(e)}")
-        logger.error(traceback.format_exc())
+        logger.warning("Session restore error: %s", e)
         return False
 
 def navigate_to_profile(driver, target_username):
     try:
-        logger.info(f"Navigating to profile: {target_username}")
+        logger.info("Navigating to profile: %s", target_username)
         
         # First try direct URL
         try:
-            logger.info("Trying direct URL navigation")
-            driver.get(f'https://www.instagram.com/{target_username}/')
-            random_sleep(3, 5)
+            logger.debug("Trying direct URL navigation")
+            driver.get(f'{INSTAGRAM_URL}/{target_username}/')
             
-            # Check if we're on the profile page
-            try:
-                WebDriverWait(driver, 10).until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, "header"))
-                )
+            # Check if we're on the profile page, or on the page for a missing one
+            wait_until(
+                driver,
+                EC.any_of(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, "header")),
+                    EC.presence_of_element_located((By.XPATH, PROFILE_UNAVAILABLE_XPATH)),
+                ),
+                10,
+            )
+            if driver.find_elements(By.CSS_SELECTOR, "header"):
                 logger.info("Successfully navigated to profile using direct URL")
                 return True
-            except TimeoutException:
-                logger.info("Direct URL navigation failed, trying search method")
+            if profile_unavailable(driver):
+                # Searching would only land on some other account
+                logger.error("Profile %s does not exist", target_username)
+                return False
+            logger.info("Direct URL navigation failed, trying search method")
         except WebDriverException:
             logger.info("Direct URL navigation failed, trying search method")
         
         # If direct URL fails, try search
         logger.info("Using search to find profile")
-        search_box = WebDriverWait(driver, 15).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "input[placeholder='Search']"))
-        )
+        search_box = wait_for_presence(driver, (By.CSS_SELECTOR, "input[placeholder='Search']"), 15)
+        if not search_box:
+            logger.error("Search box not found")
+            return False
         search_box.clear()
         search_box.send_keys(target_username)
-        random_sleep(2, 3)
 
         # Click on the first search result
-        search_result = WebDriverWait(driver, 15).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "a[role='link']"))
-        )
+        search_result = wait_for_presence(driver, (By.CSS_SELECTOR, "a[role='link']"), 15)
+        if not search_result:
+            logger.error("No search results found")
+            return False
         search_result.click()
-        random_sleep(3, 5)
         
         # Verify we're on the profile page
-        try:
-            WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "header"))
-            )
+        if wait_for_presence(driver, (By.CSS_SELECTOR, "header"), 10):
             logger.info("Successfully navigated to profile using search")
             return True
-        except TimeoutException:
-            logger.error("Failed to verify profile page")
-            return False
+        logger.error("Failed to verify profile page")
+        return False
             
     except Exception as e:
-        logger.error(f"Navigation error: {str(e)}")
-        logger.error(traceback.format_exc())
+        logger.exception("Navigation error: %s", e)
         return False
 
-def like_posts(driver):
+def like_posts(driver, result, job_budget=None):
+    # Fills in the outcome and post counts of result and returns it
     try:
-        logger.info("Starting to like posts")
-        liked_count = 0
-        
         # First, try to find posts on the profile page
-        logger.info("Looking for posts on profile page")
+        logger.debug("Looking for posts on profile page")
         
         # Wait for the page to fully load
-        random_sleep(3, 5)
-        
-        # Try to scroll down to load more posts
-        logger.info("Scrolling to load more posts")
-        for _ in range(5):  # Increased scroll count to load more posts
-            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            random_sleep(2, 3)
-        
-        # Take a screenshot for debugging
-        try:
-            screenshot_path = "profile_screenshot.png"
-            driver.save_screenshot(screenshot_path)
-            logger.info(f"Saved screenshot to {screenshot_path}")
-        except Exception as e:
-            logger.warning(f"Failed to save screenshot: {str(e)}")
+        wait_for_page(driver)
+        wait_for_presence(driver, (By.CSS_SELECTOR, "header"), 10)
+        capture(driver, "profile")
         
         # NEW APPROACH: Check if the profile is private
         try:
-            private_profile = driver.find_elements(By.XPATH, "//h2[contains(text(), 'Private')]")
+            private_profile = driver.find_elements(By.XPATH, PRIVATE_PROFILE_XPATH)
             if private_profile:
                 logger.error("This is a private profile. Cannot like posts.")
-                return 0
+                capture(driver, "private_profile", failure=True)
+                result.outcome = PRIVATE
+                return result
         except Exception as e:
-            logger.warning(f"Error checking for private profile: {str(e)}")
-        
-        # NEW APPROACH: Try to find posts using a more direct method
-        logger.info("Trying to find posts using direct method")
+            logger.warning("Error checking for private profile: %s", e)
         
-        # Try to find posts using a more direct approach
-        try:
-            # Try to find posts using the most reliable selectors
-            post_selectors = [
-                "//div[contains(@class, '_aagw')]",  # Post thumbnails
-                "//div[contains(@class, '_aabd')]",  # Post containers
-                "//div[contains(@class, '_aagv')]",  # Post grid items
-                "//div[contains(@class, 'x1i10hfl')]",  # New Instagram class
-                "//div[contains(@class, '_aag')]",  # Any element with _aag in class name
-                "//div[contains(@class, '_aab')]",  # Any element with _aab in class name
-                "//div[contains(@class, '_aac')]",  # Any element with _aac in class name
-                "//div[contains(@class, '_aad')]",  # Any element with _aad in class name
-                "//div[contains(@class, '_aae')]",  # Any element with _aae in class name
-                "//div[contains(@class, '_aaf')]",  # Any element with _aaf in class name
-                "//a[contains(@href, '/p/')]",  # Any link to a post
-                "//div[@role='button']",  # Any clickable div
-                "//div[contains(@class, 'x1i10hfl')]//a",  # Links in new Instagram class
-                "//div[contains(@class, '_aagw')]//a",  # Links in post thumbnails
-                "//div[contains(@class, '_aabd')]//a",  # Links in post containers
-                "//div[contains(@class, '_aagv')]//a",  # Links in post grid items
-                "//div[contains(@class, '_aag')]//a",  # Links in any element with _aag in class name
-                "//div[contains(@class, '_aab')]//a",  # Links in any element with _aab in class name
-                "//div[contains(@class, '_aac')]//a",  # Links in any element with _aac in class name
-                "//div[contains(@class, '_aad')]//a",  # Links in any element with _aad in class name
-                "//div[contains(@class, '_aae')]//a",  # Links in any element with _aae in class name
-                "//div[contains(@class, '_aaf')]//a"  # Links in any element with _aaf in class name
-            ]
-            
-            posts = []
-            for selector in post_selectors:
-                try:
-                    found_posts = driver.find_elements(By.XPATH, selector)
-                    if found_posts:
-                        logger.info(f"Found {len(found_posts)} posts using selector: {selector}")
-                        posts = found_posts
-                        break
-                except Exception as e:
-                    logger.warning(f"Error with selector {selector}: {str(e)}")
-            
-            if not posts:
-                logger.error("No posts found on the profile page")
-                return 0
-            
-            # Try to click each post directly
-            logger.info(f"Found {len(posts)} posts to process")
-            for i, post in enumerate(posts[:10]):  # Limit to first 10 posts
-                try:
-                    # Get current URL before clicking
-                    current_url = driver.current_url
-                    
-                    # Try to get the post URL first
-                    post_url = None
-                    try:
-                        # Try to get href attribute
-                        post_url = post.get_attribute('href')
-                        if not post_url or '/p/' not in post_url:
-                            # If no href, try to find a child link
-                            try:
-                                child_link = post.find_element(By.TAG_NAME, 'a')
-                                post_url = child_link.get_attribute('href')
-                            except NoSuchElementException:
-                                pass
-                    except Exception as e:
-                        logger.warning(f"Error getting post URL: {str(e)}")
-                    
-                    # If we have a post URL, navigate directly to it
-                    if post_url and '/p/' in post_url:
-                        logger.info(f"Navigating directly to post URL: {post_url}")
-                        driver.get(post_url)
-                        random_sleep(2, 3)
-                    else:
-                        # Otherwise, click the post
-                        logger.info("Clicking post to navigate to it")
-                        post.click()
-                        random_sleep(2, 3)
-                    
-                    # Check if URL changed to a post URL
-                    new_url = driver.current_url
-                    if '/p/' in new_url and new_url != current_url:
-                        logger.info(f"Found post URL: {new_url}")
-                        
-                        # Try to like the post
-                        try:
-                            # Wait for post to load
-                            WebDriverWait(driver, 10).until(
-                                EC.presence_of_element_located((By.TAG_NAME, "article"))
-                            )
-                            
-                            # NEW APPROACH: Try to find the like button using multiple methods
-                            like_button = None
-                            
-                            # Method 1: Try to find by aria-label
-                            try:
-                                like_button = WebDriverWait(driver, 5).until(
-                                    EC.presence_of_element_located((By.XPATH, "//button[contains(@aria-label, 'Like') and not(contains(@aria-label, 'Unlike'))]"))
-                                )
-                                logger.info("Found like button by aria-label")
-                            except TimeoutException:
-                                logger.info("Could not find like button by aria-label")
-                            
-                            # Method 2: Try to find by class name
-                            if not like_button:
-                                try:
-                                    like_button = WebDriverWait(driver, 5).until(
-                                        EC.presence_of_element_located((By.XPATH, "//button[contains(@class, '_acan') or contains(@class, '_abl-')]"))
-                                    )
-                                    logger.info("Found like button by class")
-                                except TimeoutException:
-                                    logger.info("Could not find like button by class")
-                            
-                            # Method 3: Try to find by SVG path
-                            if not like_button:
-                                try:
-                                    svg = WebDriverWait(driver, 5).until(
-                                        EC.presence_of_element_located((By.XPATH, "//svg[.//path[contains(@d, 'M16.792') or contains(@d, 'M8.389') or contains(@d, 'M12') or contains(@d, 'M21.35') or contains(@d, 'M12.001')]]"))
-                                    )
-                                    like_button = svg.find_element(By.XPATH, "./ancestor::button")
-                                    logger.info("Found like button by SVG path")
-                                except (TimeoutException, NoSuchElementException):
-                                    logger.info("Could not find like button by SVG path")
-                            
-                            # Method 4: Try to find by role
-                            if not like_button:
-                                try:
-                                    like_button = WebDriverWait(driver, 5).until(
-                                        EC.presence_of_element_located((By.XPATH, "//button[@role='button' and contains(@class, '_acan')]"))
-                                    )
-                                    logger.info("Found like button by role")
-                                except TimeoutException:
-                                    logger.info("Could not find like button by role")
-                            
-                            # Method 5: Try to find by any button with heart icon
-                            if not like_button:
-                                try:
-                                    like_button = WebDriverWait(driver, 5).until(
-                                        EC.presence_of_element_located((By.XPATH, "//button[.//svg[contains(@aria-label, 'Like')]]"))
-                                    )
-                                    logger.info("Found like button by heart icon")
-                                except TimeoutException:
-                                    logger.info("Could not find like button by heart icon")
-                            
-                            # NEW METHOD: Try to find any button that might be a like button
-                            if not like_button:
-                                try:
-                                    # Try to find any button that might be a like button
-                                    buttons = driver.find_elements(By.TAG_NAME, "button")
-                                    for button in buttons:
-                                        try:
-                                            # Check if the button has an aria-label that contains "Like"
-                                            aria_label = button.get_attribute("aria-label")
-                                            if aria_label and "Like" in aria_label and "Unlike" not in aria_label:
-                                                like_button = button
-                                                logger.info("Found like button by checking all buttons")
-                                                break
-                                        except:
-                                            continue
-                                except Exception as e:
-                                    logger.warning(f"Error finding like button by checking all buttons: {str(e)}")
-                            
-                            # If we found a like button, try to click it
-                            if like_button:
-                                # Try multiple methods to click the like button
-                                click_success = False
-                                
-                                # Method 1: Direct click with retry
-                                for _ in range(3):
-                                    try:
-                                        like_button.click()
-                                        click_success = True
-                                        logger.info("Clicked like button directly")
-                                        break
-                                    except Exception as e:
-                                        logger.warning(f"Direct click attempt failed: {str(e)}")
-                                        random_sleep(1, 2)
-                                
-                                # Method 2: JavaScript click
-                                if not click_success:
-                                    try:
-                                        driver.execute_script("arguments[0].click();", like_button)
-                                        click_success = True
-                                        logger.info("Clicked like button using JavaScript")
-                                    except Exception as e:
-                                        logger.warning(f"JavaScript click failed: {str(e)}")
-                                
-                                # Method 3: Action chains with move and click
-                                if not click_success:
-                                    try:
-                                        actions = ActionChains(driver)
-                                        actions.move_to_element(like_button)
-                                        actions.click()
-                                        actions.perform()
-                                        click_success = True
-                                        logger.info("Clicked like button using ActionChains")
-                                    except Exception as e:
-                                        logger.warning(f"ActionChains click failed: {str(e)}")
-                                
-                                # Method 4: Try to find parent button and click it
-                                if not click_success:
-                                    try:
-                                        parent_button = like_button.find_element(By.XPATH, "./ancestor::button")
-                                        parent_button.click()
-                                        click_success = True
-                                        logger.info("Clicked parent button")
-                                    except Exception as e:
-                                        logger.warning(f"Parent button click failed: {str(e)}")
-                                
-                                # Method 5: Try to find any clickable ancestor
-                                if not click_success:
-                                    try:
-                                        clickable_ancestor = like_button.find_element(By.XPATH, "./ancestor::*[@role='button' or @onclick or contains(@class, '_acan')]")
-                                        clickable_ancestor.click()
-                                        click_success = True
-                                        logger.info("Clicked clickable ancestor")
-                                    except Exception as e:
-                                        logger.warning(f"Clickable ancestor click failed: {str(e)}")
-                                
-                                # Method 6: Try to find any button on the page and click it
-                                if not click_success:
-                                    try:
-                                        all_buttons = driver.find_elements(By.TAG_NAME, "button")
-                                        for button in all_buttons:
-                                            try:
-                                                button.click()
-                                                click_success = True
-                                                logger.info("Clicked a button on the page")
-                                                break
-                                            except:
-                                                continue
-                                    except Exception as e:
-                                        logger.warning(f"All buttons click failed: {str(e)}")
-                                
-                                # Method 7: NEW - Try to find the like button by its position
-                                if not click_success:
-                                    try:
-                                        # Instagram typically has the like button in a specific position
-                                        # Try to find it by its position relative to other elements
-                                        article = driver.find_element(By.TAG_NAME, "article")
-                                        buttons = article.find_elements(By.TAG_NAME, "button")
-                                        if buttons:
-                                            # The like button is typically one of the first few buttons
-                                            for button in buttons[:3]:
-                                                try:
-                                                    button.click()
-                                                    click_success = True
-                                                    logger.info("Clicked button by position")
-                                                    break
-                                                except:
-                                                    continue
-                                    except Exception as e:
-                                        logger.warning(f"Position-based click failed: {str(e)}")
-                                
-                                # Method 8: NEW - Try to find the like button by its text content
-                                if not click_success:
-                                    try:
-                                        # Try to find any element with "Like" text
-                                        like_elements = driver.find_elements(By.XPATH, "//*[contains(text(), 'Like')]")
-                                        for element in like_elements:
-                                            try:
-                                                # Try to find a clickable ancestor
-                                                clickable = element.find_element(By.XPATH, "./ancestor::button")
-                                                clickable.click()
-                                                click_success = True
-                                                logger.info("Clicked element with 'Like' text")
-                                                break
-                                            except:
-                                                continue
-                                    except Exception as e:
-                                        logger.warning(f"Text-based click failed: {str(e)}")
-                                
-                                # Method 9: NEW - Try to find the like button by its HTML structure
-                                if not click_success:
-                                    try:
-                                        # Instagram often has a specific structure for the like button
-                                        like_containers = driver.find_elements(By.XPATH, "//div[contains(@class, '_aacl') or contains(@class, '_aaco') or contains(@class, '_aacw')]")
-                                        for container in like_containers:
-                                            try:
-                                                container.click()
-                                                click_success = True
-                                                logger.info("Clicked like container")
-                                                break
-                                            except:
-                                                continue
-                                    except Exception as e:
-                                        logger.warning(f"Container-based click failed: {str(e)}")
-                                
-                                # NEW METHOD: Try to click any element that might be a like button
-                                if not click_success:
-                                    try:
-                                        # Try to find any element that might be a like button
-                                        elements = driver.find_elements(By.XPATH, "//*[contains(@class, '_acan') or contains(@class, '_abl-') or contains(@class, '_aacl') or contains(@class, '_aaco') or contains(@class, '_aacw')]")
-                                        for element in elements:
-                                            try:
-                                                element.click()
-                                                click_success = True
-                                                logger.info("Clicked element that might be a like button")
-                                                break
-                                            except:
-                                                continue
-                                    except Exception as e:
-                                        logger.warning(f"Error clicking elements that might be like buttons: {str(e)}")
-                                
-                                # NEW METHOD: Try to click any element that might be a like button by its position
-                                if not click_success:
-                                    try:
-                                        # Try to find any element that might be a like button by its position
-                                        # Instagram typically has the like button in a specific position
-                                        # Try to find it by its position relative to other elements
-                                        article = driver.find_element(By.TAG_NAME, "article")
-                                        # Try to find any element that might be a like button
-                                        elements = article.find_elements(By.XPATH, ".//*[contains(@class, '_acan') or contains(@class, '_abl-') or contains(@class, '_aacl') or contains(@class, '_aaco') or contains(@class, '_aacw')]")
-                                        if not elements:
-                                            # If no elements found with those classes, try to find any button
-                                            elements = article.find_elements(By.TAG_NAME, "button")
-                                        
-                                        # Try to click each element
-                                        for element in elements:
-                                            try:
-                                                element.click()
-                                                click_success = True
-                                                logger.info("Clicked element by position")
-                                                break
-                                            except:
-                                                continue
-                                    except Exception as e:
-                                        logger.warning(f"Error clicking elements by position: {str(e)}")
-                                
-                                # NEW METHOD: Try to click any element in the article
-                                if not click_success:
-                                    try:
-                                        # Try to find any element in the article
-                                        article = driver.find_element(By.TAG_NAME, "article")
-                                        elements = article.find_elements(By.XPATH, ".//*")
-                                        
-                                        # Try to click each element
-                                        for element in elements:
-                                            try:
-                                                element.click()
-                                                click_success = True
-                                                logger.info("Clicked element in article")
-                                                break
-                                            except:
-                                                continue
-                                    except Exception as e:
-                                        logger.warning(f"Error clicking elements in article: {str(e)}")
-                                
-                                # Verify if the like was successful
-                                try:
-                                    # Wait for the like button to change to "Unlike"
-                                    WebDriverWait(driver, 5).until(
-                                        lambda d: any(
-                                            "Unlike" in b.get_attribute("aria-label") 
-                                            for b in d.find_elements(By.TAG_NAME, "button")
-                                        )
-                                    )
-                                    liked_count += 1
-                                    logger.info(f"Successfully liked post, total liked: {liked_count}")
-                                except TimeoutException:
-                                    logger.warning("Could not verify if post was liked")
-                            else:
-                                logger.warning("Could not find like button for this post")
-                        
-                        except Exception as e:
-                            logger.error(f"Error liking post: {str(e)}")
-                        
-                        # Go back to the profile page
-                        driver.back()
-                        random_sleep(2, 3)
-                    else:
-                        # If not a post URL, go back
-                        driver.back()
-                        random_sleep(1, 2)
-                except Exception as e:
-                    logger.warning(f"Error clicking post {i}: {str(e)}")
-                    # Try to go back to profile page
-                    try:
-                        driver.back()
-                        random_sleep(1, 2)
-                    except:
-                        pass
-        
-        except Exception as e:
-            logger.error(f"Error with direct post clicking: {str(e)}")
-        
-        # If direct clicking didn't work, try the original method
-        if liked_count == 0:
-            logger.info("Direct clicking didn't work, trying original method")
-            
-            # Updated post selectors with more reliable options
-            post_selectors = [
-                "//article//a[contains(@href, '/p/')]",  # Posts within article
-                "//div[contains(@class, 'x1i10hfl')]//a[contains(@href, '/p/')]",  # New Instagram class
-                "//div[contains(@class, '_aagv')]//a",  # Post grid items
-                "//div[contains(@class, '_aabd')]//a",  # Post containers
-                "//div[@role='presentation']//a[contains(@href, '/p/')]",  # Presentation role posts
-                "//main//article//a[contains(@href, '/p/')]",  # Main content posts
-                "//div[contains(@class, '_aagw')]//a",  # Post thumbnails
-                "//div[contains(@class, '_aagx')]//a",  # Another post container
-                "//div[contains(@class, '_aagy')]//a",  # Another post container
-                "//div[contains(@class, '_aagz')]//a",  # Another post container
-                "//div[contains(@class, '_aag')]//a",  # Any element with _aag in class name
-                "//div[contains(@class, '_aab')]//a",  # Any element with _aab in class name
-                "//div[contains(@class, '_aac')]//a",  # Any element with _aac in class name
-                "//div[contains(@class, '_aad')]//a",  # Any element with _aad in class name
-                "//div[contains(@class, '_aae')]//a",  # Any element with _aae in class name
-                "//div[contains(@class, '_aaf')]//a",  # Any element with _aaf in class name
-                "//a[contains(@href, '/p/')]",  # Any link to a post
-                "//div[contains(@class, 'x1i10hfl')]",  # New Instagram class without link
-                "//div[contains(@class, '_aagw')]",  # Post thumbnails without link
-                "//div[contains(@class, '_aabd')]",  # Post containers without link
-                "//div[contains(@class, '_aagv')]"  # Post grid items without link
-            ]
-            
-            posts = []
-            for selector in post_selectors:
-                try:
-                    found_posts = driver.find_elements(By.XPATH, selector)
-                    if found_posts:
-                        logger.info(f"Found {len(found_posts)} posts using selector: {selector}")
-                        posts = found_posts
-                        break
-                except Exception as e:
-                    logger.warning(f"Error with selector {selector}: {str(e)}")
-            
-            if not posts:
-                logger.error("No posts found on the profile page")
-                return 0
-            
-            # Extract post links
-            post_links = []
-            for post in posts:
-                try:
-                    # Try to get href attribute
-                    link = post.get_attribute('href')
-                    if link and '/p/' in link:
-                        post_links.append(link)
-                    else:
-                        # If no href, try to find a child link
-                        try:
-                            child_link = post.find_element(By.TAG_NAME, 'a')
-                            link = child_link.get_attribute('href')
-                            if link and '/p/' in link:
-                                post_links.append(link)
-                        except NoSuchElementException:
-                            # If no child link, try to click the post itself
-                            try:
-                                post.click()
-                                random_sleep(2, 3)
-                                # Get the current URL which should be a post URL
-                                current_url = driver.current_url
-                                if '/p/' in current_url:
-                                    post_links.append(current_url)
-                                # Go back to the profile
-                                driver.back()
-                                random_sleep(2, 3)
-                            except Exception as e:
-                                logger.warning(f"Error clicking post: {str(e)}")
-                except Exception as e:
-                    logger.warning(f"Error extracting post link: {str(e)}")
-            
-            if not post_links:
-                logger.error("No post links found")
-                return 0
-            
-            logger.info(f"Found {len(post_links)} post links to process")
-            
-            # Like each post
-            for i, link in enumerate(post_links):
-                logger.info(f"Processing post {i+1}/{len(post_links)}: {link}")
-                try:
-                    driver.get(link)
-                    random_sleep(2, 3)
-                    
-                    # Wait for post to load
-                    WebDriverWait(driver, 10).until(
-                        EC.presence_of_element_located((By.TAG_NAME, "article"))
-                    )
-                    
-                    # NEW APPROACH: Try to find the like button using multiple methods
-                    like_button = None
-                    
-                    # Method 1: Try to find by aria-label
-                    try:
-                        like_button = WebDriverWait(driver, 5).until(
-                            EC.presence_of_element_located((By.XPATH, "//button[contains(@aria-label, 'Like') and not(contains(@aria-label, 'Unlike'))]"))
-                        )
-                        logger.info("Found like button by aria-label")
-                    except TimeoutException:
-                        logger.info("Could not find like button by aria-label")
-                    
-                    # Method 2: Try to find by class name
-                    if not like_button:
-                        try:
-                            like_button = WebDriverWait(driver, 5).until(
-                                EC.presence_of_element_located((By.XPATH, "//button[contains(@class, '_acan') or contains(@class, '_abl-')]"))
-                            )
-                            logger.info("Found like button by class")
-                        except TimeoutException:
-                            logger.info("Could not find like button by class")
-                    
-                    # Method 3: Try to find by SVG path
-                    if not like_button:
-                        try:
-                            svg = WebDriverWait(driver, 5).until(
-                                EC.presence_of_element_located((By.XPATH, "//svg[.//path[contains(@d, 'M16.792') or contains(@d, 'M8.389') or contains(@d, 'M12') or contains(@d, 'M21.35') or contains(@d, 'M12.001')]]"))
-                            )
-                            like_button = svg.find_element(By.XPATH, "./ancestor::button")
-                            logger.info("Found like button by SVG path")
-                        except (TimeoutException, NoSuchElementException):
-                            logger.info("Could not find like button by SVG path")
-                    
-                    # Method 4: Try to find by role
-                    if not like_button:
-                        try:
-                            like_button = WebDriverWait(driver, 5).until(
-                                EC.presence_of_element_located((By.XPATH, "//button[@role='button' and contains(@class, '_acan')]"))
-                            )
-                            logger.info("Found like button by role")
-                        except TimeoutException:
-                            logger.info("Could not find like button by role")
-                    
-                    # Method 5: Try to find by any button with heart icon
-                    if not like_button:
-                        try:
-                            like_button = WebDriverWait(driver, 5).until(
-                                EC.presence_of_element_located((By.XPATH, "//button[.//svg[contains(@aria-label, 'Like')]]"))
-                            )
-                            logger.info("Found like button by heart icon")
-                        except TimeoutException:
-                            logger.info("Could not find like button by heart icon")
-                    
-                    # NEW METHOD: Try to find any button that might be a like button
-                    if not like_button:
-                        try:
-                            # Try to find any button that might be a like button
-                            buttons = driver.find_elements(By.TAG_NAME, "button")
-                            for button in buttons:
-                                try:
-                                    # Check if the button has an aria-label that contains "Like"
-                                    aria_label = button.get_attribute("aria-label")
-                                    if aria_label and "Like" in aria_label and "Unlike" not in aria_label:
-                                        like_button = button
-                                        logger.info("Found like button by checking all buttons")
-                                        break
-                                except:
-                                    continue
-                        except Exception as e:
-                            logger.warning(f"Error finding like button by checking all buttons: {str(e)}")
-                    
-                    # If we found a like button, try to click it
-                    if like_button:
-                        # Try multiple methods to click the like button
-                        click_success = False
-                        
-                        # Method 1: Direct click with retry
-                        for _ in range(3):
-                            try:
-                                like_button.click()
-                                click_success = True
-                                logger.info("Clicked like button directly")
-                                break
-                            except Exception as e:
-                                logger.warning(f"Direct click attempt failed: {str(e)}")
-                                random_sleep(1, 2)
-                        
-                        # Method 2: JavaScript click
-                        if not click_success:
-                            try:
-                                driver.execute_script("arguments[0].click();", like_button)
-                                click_success = True
-                                logger.info("Clicked like button using JavaScript")
-                            except Exception as e:
-                                logger.warning(f"JavaScript click failed: {str(e)}")
-                        
-                        # Method 3: Action chains with move and click
-                        if not click_success:
-                            try:
-                                actions = ActionChains(driver)
-                                actions.move_to_element(like_button)
-                                actions.click()
-                                actions.perform()
-                                click_success = True
-                                logger.info("Clicked like button using ActionChains")
-                            except Exception as e:
-                                logger.warning(f"ActionChains click failed: {str(e)}")
-                        
-                        # Method 4: Try to find parent button and click it
-                        if not click_success:
-                            try:
-                                parent_button = like_button.find_element(By.XPATH, "./ancestor::button")
-                                parent_button.click()
-                                click_success = True
-                                logger.info("Clicked parent button")
-                            except Exception as e:
-                                logger.warning(f"Parent button click failed: {str(e)}")
-                        
-                        # Method 5: Try to find any clickable ancestor
-                        if not click_success:
-                            try:
-                                clickable_ancestor = like_button.find_element(By.XPATH, "./ancestor::*[@role='button' or @onclick or contains(@class, '_acan')]")
-                                clickable_ancestor.click()
-                                click_success = True
-                                logger.info("Clicked clickable ancestor")
-                            except Exception as e:
-                                logger.warning(f"Clickable ancestor click failed: {str(e)}")
-                        
-                        # Method 6: Try to find any button on the page and click it
-                        if not click_success:
-                            try:
-                                all_buttons = driver.find_elements(By.TAG_NAME, "button")
-                                for button in all_buttons:
-                                    try:
-                                        button.click()
-                                        click_success = True
-                                        logger.info("Clicked a button on the page")
-                                        break
-                                    except:
-                                        continue
-                            except Exception as e:
-                                logger.warning(f"All buttons click failed: {str(e)}")
-                        
-                        # Method 7: NEW - Try to find the like button by its position
-                        if not click_success:
-                            try:
-                                # Instagram typically has the like button in a specific position
-                                # Try to find it by its position relative to other elements
-                                article = driver.find_element(By.TAG_NAME, "article")
-                                buttons = article.find_elements(By.TAG_NAME, "button")
-                                if buttons:
-                                    # The like button is typically one of the first few buttons
-                                    for button in buttons[:3]:
-                                        try:
-                                            button.click()
-                                            click_success = True
-                                            logger.info("Clicked button by position")
-                                            break
-                                        except:
-                                            continue
-                            except Exception as e:
-                                logger.warning(f"Position-based click failed: {str(e)}")
-                        
-                        # Method 8: NEW - Try to find the like button by its text content
-                        if not click_success:
-                            try:
-                                # Try to find any element with "Like" text
-                                like_elements = driver.find_elements(By.XPATH, "//*[contains(text(), 'Like')]")
-                                for element in like_elements:
-                                    try:
-                                        # Try to find a clickable ancestor
-                                        clickable = element.find_element(By.XPATH, "./ancestor::button")
-                                        clickable.click()
-                                        click_success = True
-                                        logger.info("Clicked element with 'Like' text")
-                                        break
-                                    except:
-                                        continue
-                            except Exception as e:
-                                logger.warning(f"Text-based click failed: {str(e)}")
-                        
-                        # Method 9: NEW - Try to find the like button by its HTML structure
-                        if not click_success:
-                            try:
-                                # Instagram often has a specific structure for the like button
-                                like_containers = driver.find_elements(By.XPATH, "//div[contains(@class, '_aacl') or contains(@class, '_aaco') or contains(@class, '_aacw')]")
-                                for container in like_containers:
-                                    try:
-                                        container.click()
-                                        click_success = True
-                                        logger.info("Clicked like container")
-                                        break
-                                    except:
-                                        continue
-                            except Exception as e:
-                                logger.warning(f"Container-based click failed: {str(e)}")
-                        
-                        # NEW METHOD: Try to click any element that might be a like button
-                        if not click_success:
-                            try:
-                                # Try to find any element that might be a like button
-                                elements = driver.find_elements(By.XPATH, "//*[contains(@class, '_acan') or contains(@class, '_abl-') or contains(@class, '_aacl') or contains(@class, '_aaco') or contains(@class, '_aacw')]")
-                                for element in elements:
-                                    try:
-                                        element.click()
-                                        click_success = True
-                                        logger.info("Clicked element that might be a like button")
-                                        break
-                                    except:
-                                        continue
-                            except Exception as e:
-                                logger.warning(f"Error clicking elements that might be like buttons: {str(e)}")
-                        
-                        # NEW METHOD: Try to click any element that might be a like button by its position
-                        if not click_success:
-                            try:
-                                # Try to find any element that might be a like button by its position
-                                # Instagram typically has the like button in a specific position
-                                # Try to find it by its position relative to other elements
-                                article = driver.find_element(By.TAG_NAME, "article")
-                                # Try to find any element that might be a like button
-                                elements = article.find_elements(By.XPATH, ".//*[contains(@class, '_acan') or contains(@class, '_abl-') or contains(@class, '_aacl') or contains(@class, '_aaco') or contains(@class, '_aacw')]")
-                                if not elements:
-                                    # If no elements found with those classes, try to find any button
-                                    elements = article.find_elements(By.TAG_NAME, "button")
-                                
-                                # Try to click each element
-                                for element in elements:
-                                    try:
-                                        element.click()
-                                        click_success = True
-                                        logger.info("Clicked element by position")
-                                        break
-                                    except:
-                                        continue
-                            except Exception as e:
-                                logger.warning(f"Error clicking elements by position: {str(e)}")
-                        
-                        # NEW METHOD: Try to click any element in the article
-                        if not click_success:
-                            try:
-                                # Try to find any element in the article
-                                article = driver.find_element(By.TAG_NAME, "article")
-                                elements = article.find_elements(By.XPATH, ".//*")
-                                
-                                # Try to click each element
-                                for element in elements:
-                                    try:
-                                        element.click()
-                                        click_success = True
-                                        logger.info("Clicked element in article")
-                                        break
-                                    except:
-                                        continue
-                            except Exception as e:
-                                logger.warning(f"Error clicking elements in article: {str(e)}")
-                        
-                        # Verify if the like was successful
-                        try:
-                            # Wait for the like button to change to "Unlike"
-                            WebDriverWait(driver, 5).until(
-                                lambda d: any(
-                                    "Unlike" in b.get_attribute("aria-label") 
-                                    for b in d.find_elements(By.TAG_NAME, "button")
-                                )
-                            )
-                            liked_count += 1
-                            logger.info(f"Successfully liked post {i+1}, total liked: {liked_count}")
-                        except TimeoutException:
-                            logger.warning(f"Could not verify if post {i+1} was liked")
-                    else:
-                        logger.info(f"Post {i+1} already liked or like button not found")
-                    
-                except Exception as e:
-                    logger.error(f"Error processing post {i+1}: {str(e)}")
-                    continue
+        # Discover, open, locate, click and verify each post exactly once
+        pipeline = LikePipeline(
+            driver,
+            LIKE_BUTTON_SELECTORS,
+            PROFILE_POST_SELECTORS,
+            PACING,
+            max_posts=config.MAX_POSTS_PER_TARGET,
+            direct_navigation=config.DIRECT_POST_NAVIGATION,
+            broad_clicks=config.BROAD_CLICK_STRATEGIES,
+            job_budget=job_budget,
+            post_seconds=config.POST_TIME_BUDGET_SECONDS,
+            post_commands=config.POST_COMMAND_BUDGET,
+        )
+        pipeline.run()
 
-        logger.info(f"Finished liking posts. Total liked: {liked_count}")
-        return liked_count
+        counts = pipeline.counts()
+        result.posts_found = pipeline.found
+        result.liked = counts["liked"]
+        result.skipped = counts["skipped"]
+        result.failed = counts["failed"]
+        result.stop_reason = pipeline.stop_reason
+        if not pipeline.found:
+            result.outcome = NO_POSTS
+        elif result.failed or pipeline.stop_reason or any(
+                post["outcome"] == BUDGET_EXHAUSTED for post in pipeline.results):
+            result.outcome = PARTIAL
+        else:
+            # Posts that were already liked need nothing more, so they still count as ok
+            result.outcome = OK
+        return result
     except Exception as e:
-        logger.error(f"Like posts error: {str(e)}")
-        logger.error(traceback.format_exc())
-        return 0
+        logger.exception("Like posts error: %s", e)
+        capture(driver, "like_posts_error", failure=True)
+        result.outcome = ERROR
+        result.error = str(e)
+        return result
+
+def login_rejected(driver):
+    try:
+        return bool(driver.find_elements(By.ID, "slfErrorAlert"))
+    except WebDriverException:
+        return False
+
+def profile_unavailable(driver):
+    try:
+        return bool(driver.find_elements(By.XPATH, PROFILE_UNAVAILABLE_XPATH))
+    except WebDriverException:
+        return False
+
+def process_target(driver, target_username, budget):
+    # Navigate to one profile and like its posts on an already logged-in driver
+    result = TargetResult(target_username)
+    logger.debug("Attempting to navigate to target profile")
+    with phase("navigate"), stage("navigate", target_username=target_username):
+        if not navigate_to_profile(driver, target_username):
+            capture(driver, "navigation_failed", failure=True)
+            if profile_unavailable(driver):
+                result.outcome = PROFILE_NOT_FOUND
+            else:
+                result.error = "Failed to navigate to target profile."
+            return result
 
-def start_like_automation(your_username, your_password, target_username):
+    logger.info("Starting to like posts")
+    with stage("like_posts", target_username=target_username):
+        return like_posts(driver, result, budget)
+
+def start_batch_automation(your_username, your_password, target_usernames, driver_pool=None, session_store=None,
+                           on_result=None):
+    # Logs in once and works through the targets in order on the same driver.
+    # Each target gets a TargetResult, passed to on_result as soon as it is known.
     driver = None
+    results = []
+    wait_stats = begin_wait_stats()
+    trace = begin_trace()
+    job_id = current_job_id()
+    # Bounds the whole job, login and every target included, with the configured
+    # allowance per target; each target's budget is its child
+    job_budget = Budget(
+        "job",
+        config.JOB_TIME_BUDGET_SECONDS * len(target_usernames),
+        config.JOB_COMMAND_BUDGET * len(target_usernames),
+    )
+    begin_artifacts(ARTIFACT_WRITER, config.DEBUG_ARTIFACTS, job_id, config.DEBUG_ARTIFACT_HTML)
+
+    def finish(result, started=None, since=0):
+        # The first target's phases include starting the browser and logging in
+        result.phases = trace.phase_totals(since)
+        if started:
+            result.seconds = round(time.time() - started, 3)
+        results.append(result)
+        JOBS.inc(outcome=result.outcome)
+        emit("target_result", **result.to_dict())
+        if on_result:
+            on_result(result)
+
+    def finish_remaining(outcome, error=None, stop_reason=None):
+        for target_username in target_usernames[len(results):]:
+            result = TargetResult(target_username, outcome, error)
+            result.stop_reason = stop_reason
+            finish(result, since=len(trace.spans) if results else 0)
+
     try:
-        logger.info(f"Starting automation for target: {target_username}")
-        driver = setup_driver()
+        logger.info("Starting automation for %s target(s): %s", len(target_usernames), ", ".join(target_usernames))
+        with phase("setup_driver"), stage("setup_driver"):
+            if driver_pool:
+                driver = driver_pool.acquire()
+            else:
+                with UNPOOLED_DRIVERS.launching():
+                    driver = setup_driver()
+                UNPOOLED_DRIVERS.add(driver)
+            if config.NETWORK_REPORT:
+                # Drop events left over from the pooled driver's previous job
+                drain_performance_log(driver)
         
         # Login to Instagram
-        logger.info("Attempting to login")
-        if not login_to_instagram(driver, your_username, your_password):
-            return "Failed to login to Instagram. Please check your credentials."
+        logger.debug("Attempting to login")
+        with phase("login"), stage("login"):
+            logged_in = session_store is not None and restore_session(driver, your_username, your_password, session_store)
+            if not logged_in:
+                logged_in = login_to_instagram(driver, your_username, your_password)
+                if logged_in and session_store:
+                    session_store.save(your_username, your_password, driver)
+        if not logged_in:
+            capture(driver, "login_failed", failure=True)
+            # Only a rejection is final; a login page that never loaded may work next time
+            if login_rejected(driver):
+                finish_remaining(AUTH_FAILED)
+            else:
+                finish_remaining(ERROR, "Login did not complete")
+            return results
 
-        # Navigate to target profile
-        logger.info("Attempting to navigate to target profile")
-        if not navigate_to_profile(driver, target_username):
-            return "Failed to navigate to target profile."
+        for i, target_username in enumerate(target_usernames):
+            # Keep a human pace between profiles as well as between posts
+            if i > 0:
+                PACING.pause("between_targets")
+            reason = job_budget.exhausted()
+            if reason:
+                logger.warning("Skipping %s remaining targets: %s exhausted", len(target_usernames) - i, reason)
+                finish_remaining(SKIPPED, stop_reason=reason)
+                break
+            started = time.time()
+            since = len(trace.spans) if i > 0 else 0
+            emit("target", target_username=target_username, index=i, total=len(target_usernames))
+            # An optional per-target limit keeps one slow profile from using up the job's budget
+            target_budget = Budget("target", config.TARGET_TIME_BUDGET_SECONDS, config.TARGET_COMMAND_BUDGET,
+                                   parent=job_budget)
+            with job_context(job_id, target_username):
+                try:
+                    result = process_target(driver, target_username, target_budget)
+                except Exception as e:
+                    logger.exception("Automation error for %s: %s", target_username, e)
+                    capture(driver, "automation_error", failure=True)
+                    result = TargetResult(target_username, ERROR, str(e))
+                logger.info("Finished %s: %s", target_username, result.outcome,
+                            extra={"event": "target_result", "result": result.to_dict()})
+                finish(result, started, since)
 
-        # Like posts
-        logger.info("Starting to like posts")
-        liked_count = like_posts(driver)
-        
-        if liked_count == 0:
-            return f"No posts were liked on {target_username}'s profile. This could be because the profile is private, has no posts, or the posts are not accessible."
-        
-        return f"Successfully liked {liked_count} posts on {target_username}'s profile!"
+        return results
 
     except Exception as e:
-        logger.error(f"Automation error: {str(e)}")
-        logger.error(traceback.format_exc())
-        return f"An error occurred: {str(e)}"
+        logger.exception("Automation error: %s", e)
+        capture(driver, "automation_error", failure=True)
+        finish_remaining(ERROR, str(e))
+        return results
     
     finally:
-        if driver:
-            logger.info("Closing browser")
-            driver.quit() 
\ No newline at end of file
+        logger.info(
+            "Waited %.2fs for page readiness (%s waits, %s timeouts) and %.2fs on pacing (%s pauses)",
+            wait_stats.readiness_seconds, wait_stats.readiness_waits, wait_stats.readiness_timeouts,
+            wait_stats.pacing_seconds, wait_stats.pacing_pauses,
+            extra={"event": "wait_stats", "waits": wait_stats.to_dict()},
+        )
+        if driver and config.NETWORK_REPORT:
+            trace.network = summarize_network(drain_performance_log(driver), NETWORK_BASELINE)
+            logger.info(
+                "Downloaded %s bytes in %s requests, blocked %s requests (about %s bytes saved)",
+                trace.network["totals"]["bytes"], trace.network["totals"]["requests"],
+                trace.network["totals"]["blocked"], trace.network["totals"]["estimated_saved_bytes"],
+                extra={"event": "network", "network": trace.network},
+            )
+        with phase("teardown"), stage("teardown"):
+            if driver and driver_pool:
+                logger.debug("Returning browser to pool")
+                driver_pool.release(driver)
+            elif driver:
+                logger.debug("Closing browser")
+                try:
+                    driver.quit()
+                finally:
+                    UNPOOLED_DRIVERS.discard(driver)
+        for span in trace.spans:
+            PHASE_DURATION.observe(span.duration, phase=span.name)
+        phases = trace.phase_totals()
+        logger.info("Phase timings: %s", phases, extra={"event": "phase_timings", "phases": phases})
+        commands = trace.command_summary()
+        logger.info(
+            "Issued %s WebDriver commands (%s errors) in %.2fs",
+            commands["total_commands"], commands["errors"], commands["total_seconds"],
+            extra={"event": "webdriver_commands", "commands": commands},
+        )
+
+def start_like_automation(your_username, your_password, target_username, driver_pool=None, session_store=None):
+    return start_batch_automation(your_username, your_password, [target_username], driver_pool, session_store)[0]
@@ -0,0 +1,260 @@
+import argparse
+import json
+import logging
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+import psutil
+
+from log_setup import configure_logging, job_context
+from mock_instagram import start_mock_server
+
+logger = logging.getLogger("benchmark")
+
+PHASE_ORDER = [
+    "setup_driver", "login", "navigate", "scroll", "discover",
+    "like", "open", "precheck", "locate", "click", "verify",
+    "teardown",
+]
+
+
+def percentile(values, percent):
+    # Nearest-rank percentile, good enough for a handful of runs
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, int(round(percent / 100.0 * len(ordered))))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def summarize(values):
+    if not values:
+        return None
+    return {
+        "p50": round(percentile(values, 50), 4),
+        "p95": round(percentile(values, 95), 4),
+        "mean": round(statistics.mean(values), 4),
+        "samples": len(values),
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=os.path.dirname(os.path.abspath(__file__)),
+            stderr=subprocess.DEVNULL, text=True,
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class RssSampler:
+    # Samples the resident memory of every process this one has spawned
+    # (chromedriver and Chrome) in the background while a job runs
+    def __init__(self, interval=0.25):
+        self.interval = interval
+        self.samples = []
+        self._stop = threading.Event()
+        self._thread = None
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self._run, name="rss-sampler", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+        return False
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.samples.append(self.sample())
+            self._stop.wait(self.interval)
+
+    @staticmethod
+    def sample():
+        total = 0
+        for process in psutil.Process().children(recursive=True):
+            try:
+                total += process.memory_info().rss
+            except psutil.Error:
+                continue
+        return total
+
+    def peak_mb(self):
+        return max(self.samples, default=0) / (1024 * 1024)
+
+    def mean_mb(self):
+        return statistics.mean(self.samples) / (1024 * 1024) if self.samples else 0
+
+
+def run_benchmark(args):
+    server = None
+    base_url = args.base_url
+    if not base_url:
+        server = start_mock_server(posts_per_profile=args.posts)
+        base_url = server.base_url
+
+    # automation reads these settings at import time; instrumentation counts the commands
+    os.environ["INSTAGRAM_BASE_URL"] = base_url
+    os.environ["WEBDRIVER_INSTRUMENTATION"] = "true"
+    import automation
+    from tracing import current_trace
+
+    if args.no_pacing:
+        automation.PACING.enabled = False
+
+    # Unblocked runs go first so their downloads calibrate the savings estimates
+    blocking_modes = {"on": [True], "off": [False], "both": [False, True]}[args.network_blocking]
+    automation.config.NETWORK_REPORT = True
+
+    profiles = {}
+    try:
+        for profile in args.profiles:
+            for blocking in blocking_modes:
+                automation.config.NETWORK_BLOCKING = blocking
+                name = f"{profile}+blocking" if blocking and len(blocking_modes) > 1 else profile
+                profiles[name] = run_profile(args, automation, current_trace, server, profile)
+    finally:
+        if server:
+            server.stop()
+
+    return {
+        "commit": git_commit(),
+        "timestamp": time.time(),
+        "base_url": base_url,
+        "target": args.target,
+        "runs": args.runs,
+        "pacing": not args.no_pacing,
+        "network_blocking": args.network_blocking,
+        "profiles": profiles,
+    }
+
+
+def run_profile(args, automation, current_trace, server, profile):
+    # setup_driver reads the launch profile from config on every call
+    automation.config.BROWSER_PROFILE = profile
+
+    phase_seconds = {}
+    phase_commands = {}
+    span_seconds = {}
+    runs = []
+
+    for run in range(args.runs):
+        if server:
+            server.reset()
+
+        started = time.time()
+        with RssSampler() as rss, job_context(f"{profile}-{run + 1}", args.target):
+            result = automation.start_like_automation(args.username, args.password, args.target)
+        wall = time.time() - started
+        trace = current_trace()
+
+        totals = trace.phase_totals()
+        for name, entry in totals.items():
+            phase_seconds.setdefault(name, []).append(entry["seconds"])
+            phase_commands.setdefault(name, []).append(entry["commands"])
+        for span in trace.spans:
+            span_seconds.setdefault(span.name, []).append(span.duration)
+
+        runs.append({
+            "run": run,
+            "wall_seconds": round(wall, 4),
+            "peak_rss_mb": round(rss.peak_mb(), 1),
+            "mean_rss_mb": round(rss.mean_mb(), 1),
+            "result": result.to_dict(),
+            "network": trace.network["totals"] if trace.network else None,
+            "phases": totals,
+            "commands": trace.command_summary(),
+        })
+        logger.info("[%s] Run %s/%s finished in %.2fs (peak RSS %.0f MB): %s",
+                    profile, run + 1, args.runs, wall, rss.peak_mb(), result.outcome)
+
+    names = [name for name in PHASE_ORDER if name in phase_seconds]
+    names += sorted(name for name in phase_seconds if name not in PHASE_ORDER)
+
+    return {
+        "wall_seconds": summarize([run["wall_seconds"] for run in runs]),
+        "peak_rss_mb": summarize([run["peak_rss_mb"] for run in runs]),
+        "mean_rss_mb": summarize([run["mean_rss_mb"] for run in runs]),
+        "network_bytes": summarize([run["network"]["bytes"] for run in runs if run["network"]]),
+        "blocked_requests": summarize([run["network"]["blocked"] for run in runs if run["network"]]),
+        "phases": {
+            name: {
+                "per_job_seconds": summarize(phase_seconds[name]),
+                "per_span_seconds": summarize(span_seconds.get(name, [])),
+                "commands_per_job": summarize(phase_commands[name]),
+            }
+            for name in names
+        },
+        "results": runs,
+    }
+
+
+def print_report(report):
+    for profile, entry in report["profiles"].items():
+        print(f"\nBenchmark @ {report['commit']} against {report['base_url']} "
+              f"({report['runs']} runs, {profile} profile)")
+        print(f"{'phase':<14}{'p50 s':>10}{'p95 s':>10}{'span p50':>10}{'commands':>10}")
+        for name, phase in entry["phases"].items():
+            per_job = phase["per_job_seconds"]
+            per_span = phase["per_span_seconds"]
+            commands = phase["commands_per_job"]
+            print(f"{name:<14}{per_job['p50']:>10.3f}{per_job['p95']:>10.3f}{per_span['p50']:>10.3f}{commands['p50']:>10.0f}")
+        wall = entry["wall_seconds"]
+        if wall:
+            print(f"{'total':<14}{wall['p50']:>10.3f}{wall['p95']:>10.3f}")
+
+    if len(report["profiles"]) > 1:
+        print(f"\n{'profile':<18}{'job p50 s':>10}{'job p95 s':>10}{'peak MB':>10}{'mean MB':>10}"
+              f"{'net KB':>10}{'blocked':>10}")
+        for profile, entry in report["profiles"].items():
+            wall = entry["wall_seconds"]
+            peak = entry["peak_rss_mb"]
+            mean = entry["mean_rss_mb"]
+            network = entry["network_bytes"]
+            blocked = entry["blocked_requests"]
+            if wall:
+                print(f"{profile:<18}{wall['p50']:>10.3f}{wall['p95']:>10.3f}{peak['p50']:>10.0f}{mean['p50']:>10.0f}"
+                      f"{network['p50'] / 1024 if network else 0:>10.0f}{blocked['p50'] if blocked else 0:>10.0f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Per-phase latency benchmark for start_like_automation")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--target", default="target", help="Profile to like posts on")
+    parser.add_argument("--username", default="benchmark")
+    parser.add_argument("--password", default="password")
+    parser.add_argument("--posts", type=int, default=24, help="Posts per profile on the mock server")
+    parser.add_argument("--base-url", help="Run against this site instead of a local mock server")
+    parser.add_argument("--no-pacing", action="store_true", help="Disable deliberate pacing pauses")
+    parser.add_argument("--network-blocking", choices=["on", "off", "both"], default="on",
+                        help="Run with asset blocking on, off, or both for comparison")
+    parser.add_argument("--profiles", default="default",
+                        help="Comma-separated browser launch profiles to compare, e.g. default,lean")
+    parser.add_argument("--output", help="Write the JSON report here (default: bench_results/<commit>-<time>.json)")
+    args = parser.parse_args(argv)
+    args.profiles = [profile.strip() for profile in args.profiles.split(",") if profile.strip()]
+
+    configure_logging(os.environ.get("LOG_LEVEL", "INFO"), os.environ.get("LOG_FORMAT", "text"))
+
+    report = run_benchmark(args)
+    output = args.output or os.path.join(
+        "bench_results", f"{report['commit'] or 'unknown'}-{time.strftime('%Y%m%d-%H%M%S')}.json"
+    )
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    print_report(report)
+    print(f"\nWrote {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,145 @@
+import os
+
+from dotenv import load_dotenv
+
+# Load .env before anything reads the settings below
+load_dotenv()
+
+
+def _env_int(name, default):
+    value = os.environ.get(name)
+    if value is None or value.strip() == "":
+        return default
+    return int(value)
+
+
+# Logging: "json" lines tagged with the job id, or "text"; LOG_LEVELS sets per-logger
+# levels such as "like_engine=DEBUG,selector_engine=WARNING". Repeated DEBUG messages are
+# sampled: the first LOG_SAMPLE_FIRST per job, then one in every LOG_SAMPLE_EVERY.
+LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.environ.get("LOG_FORMAT", "json").lower()
+LOG_LEVELS = dict(
+    item.strip().split("=", 1) for item in os.environ.get("LOG_LEVELS", "").split(",") if "=" in item
+)
+LOG_SAMPLE_FIRST = _env_int("LOG_SAMPLE_FIRST", 5)
+LOG_SAMPLE_EVERY = _env_int("LOG_SAMPLE_EVERY", 20)
+
+# Site the automation drives; point it at the mock server (python -m mock_instagram) for local runs
+INSTAGRAM_BASE_URL = os.environ.get("INSTAGRAM_BASE_URL", "https://www.instagram.com").rstrip("/")
+
+# Job queue
+MAX_CONCURRENT_JOBS = _env_int("MAX_CONCURRENT_JOBS", 2)
+MAX_PENDING_JOBS = _env_int("MAX_PENDING_JOBS", 20)
+JOB_HISTORY_SIZE = _env_int("JOB_HISTORY_SIZE", 100)
+# Target profiles one batch job may work through on a single logged-in browser
+MAX_TARGETS_PER_BATCH = _env_int("MAX_TARGETS_PER_BATCH", 10)
+# Idle seconds before /jobs/<id>/events sends a keepalive comment
+JOB_EVENTS_KEEPALIVE_SECONDS = _env_int("JOB_EVENTS_KEEPALIVE_SECONDS", 15)
+
+# Warm pool of launched Chrome drivers (0 launches a fresh browser per job)
+DRIVER_POOL_SIZE = _env_int("DRIVER_POOL_SIZE", MAX_CONCURRENT_JOBS)
+DRIVER_MAX_USES = _env_int("DRIVER_MAX_USES", 20)
+DRIVER_MAX_RSS_MB = _env_int("DRIVER_MAX_RSS_MB", 1500)
+
+# Chrome launch profile: "default" runs a maximized, fully rendering browser; "lean" runs
+# headless with a small viewport, no images, no autoplay and fewer renderer processes
+BROWSER_PROFILE = os.environ.get("BROWSER_PROFILE", "default").lower()
+BROWSER_WINDOW_SIZE = os.environ.get("BROWSER_WINDOW_SIZE", "1280,900")
+BROWSER_RENDERER_PROCESS_LIMIT = _env_int("BROWSER_RENDERER_PROCESS_LIMIT", 2)
+
+# Asset requests refused through CDP Network.setBlockedURLs. Categories are images, media,
+# fonts and analytics; NETWORK_BLOCK_PATTERNS adds wildcard patterns, and any pattern that
+# would match a NETWORK_ALLOW_URLS entry (scripts the UI needs) is not applied
+NETWORK_BLOCKING = os.environ.get("NETWORK_BLOCKING", "true").lower() in ("1", "true", "yes")
+NETWORK_BLOCK_CATEGORIES = [
+    category.strip()
+    for category in os.environ.get("NETWORK_BLOCK_CATEGORIES", "images,media,fonts,analytics").split(",")
+    if category.strip()
+]
+NETWORK_BLOCK_PATTERNS = [
+    pattern.strip() for pattern in os.environ.get("NETWORK_BLOCK_PATTERNS", "").split(",") if pattern.strip()
+]
+NETWORK_ALLOW_URLS = [
+    url.strip()
+    for url in os.environ.get(
+        "NETWORK_ALLOW_URLS",
+        f"https://static.cdninstagram.com/rsrc.php/*.js,{INSTAGRAM_BASE_URL}/static/*.js",
+    ).split(",")
+    if url.strip()
+]
+
+# Per-page request, byte and blocked-request counts in each job's summary (reads Chrome's
+# performance log)
+NETWORK_REPORT = os.environ.get("NETWORK_REPORT", "true" if NETWORK_BLOCKING else "false").lower() in ("1", "true", "yes")
+# Learned typical request size per resource type, used to estimate what blocking saved
+NETWORK_BASELINE_PATH = os.environ.get(
+    "NETWORK_BASELINE_PATH",
+    os.path.join(os.path.expanduser("~"), ".cache", "instaautomation", "network_baseline.json"),
+)
+
+# On-disk record of the resolved ChromeDriver, shared across processes and restarts
+DRIVER_MANIFEST_PATH = os.environ.get(
+    "DRIVER_MANIFEST_PATH",
+    os.path.join(os.path.expanduser("~"), ".cache", "instaautomation", "chromedriver.json"),
+)
+
+# Encrypted store of logged-in sessions so repeat runs can skip the login form
+SESSION_STORE_ENABLED = os.environ.get("SESSION_STORE_ENABLED", "true").lower() in ("1", "true", "yes")
+SESSION_STORE_DIR = os.environ.get(
+    "SESSION_STORE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "instaautomation", "sessions"),
+)
+# The key lives apart from the ciphertext it protects (config dir, not the cache dir)
+SESSION_KEY_PATH = os.environ.get(
+    "SESSION_KEY_PATH",
+    os.path.join(
+        os.environ.get("XDG_CONFIG_HOME") or os.path.join(os.path.expanduser("~"), ".config"),
+        "instaautomation",
+        "session.key",
+    ),
+)
+SESSION_MAX_AGE_DAYS = _env_int("SESSION_MAX_AGE_DAYS", 30)
+
+# Persisted hit-rate ranking of selector strategies
+SELECTOR_SCOREBOARD_PATH = os.environ.get(
+    "SELECTOR_SCOREBOARD_PATH",
+    os.path.join(os.path.expanduser("~"), ".cache", "instaautomation", "selector_scores.json"),
+)
+
+# Posts liked per target profile
+MAX_POSTS_PER_TARGET = _env_int("MAX_POSTS_PER_TARGET", 10)
+
+# Deliberate pacing between actions, separate from readiness waits (scale 0 disables it)
+PACING_ENABLED = os.environ.get("PACING_ENABLED", "true").lower() in ("1", "true", "yes")
+PACING_SCALE = float(os.environ.get("PACING_SCALE", "1.0"))
+
+# Screenshots and page sources for debugging: "off", "failure" (only when a step fails) or
+# "always"; written per job in the background and pruned to the size, count and age limits
+DEBUG_ARTIFACTS = os.environ.get("DEBUG_ARTIFACTS", "failure").lower()
+DEBUG_ARTIFACT_DIR = os.environ.get(
+    "DEBUG_ARTIFACT_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "instaautomation"),
+)
+DEBUG_ARTIFACT_HTML = os.environ.get("DEBUG_ARTIFACT_HTML", "true").lower() in ("1", "true", "yes")
+DEBUG_ARTIFACT_MAX_FILES = _env_int("DEBUG_ARTIFACT_MAX_FILES", 200)
+DEBUG_ARTIFACT_MAX_MB = _env_int("DEBUG_ARTIFACT_MAX_MB", 200)
+DEBUG_ARTIFACT_MAX_AGE_DAYS = _env_int("DEBUG_ARTIFACT_MAX_AGE_DAYS", 7)
+
+# Wall-time and WebDriver-command limits for each post, each target profile of a batch and
+# the whole job (0 disables a limit); command limits only apply with WEBDRIVER_INSTRUMENTATION on
+POST_TIME_BUDGET_SECONDS = float(os.environ.get("POST_TIME_BUDGET_SECONDS", "30"))
+POST_COMMAND_BUDGET = _env_int("POST_COMMAND_BUDGET", 80)
+TARGET_TIME_BUDGET_SECONDS = float(os.environ.get("TARGET_TIME_BUDGET_SECONDS", "0"))
+TARGET_COMMAND_BUDGET = _env_int("TARGET_COMMAND_BUDGET", 0)
+JOB_TIME_BUDGET_SECONDS = float(os.environ.get("JOB_TIME_BUDGET_SECONDS", "600"))
+JOB_COMMAND_BUDGET = _env_int("JOB_COMMAND_BUDGET", 2000)
+
+# Click strategies that may hit something other than the like button (any button on the
+# page, any element in the article); off unless explicitly enabled
+BROAD_CLICK_STRATEGIES = os.environ.get("BROAD_CLICK_STRATEGIES", "false").lower() in ("1", "true", "yes")
+
+# Go straight from one collected post URL to the next instead of back through the grid
+DIRECT_POST_NAVIGATION = os.environ.get("DIRECT_POST_NAVIGATION", "true").lower() in ("1", "true", "yes")
+
+# Record every WebDriver command's name, caller, latency and error
+WEBDRIVER_INSTRUMENTATION = os.environ.get("WEBDRIVER_INSTRUMENTATION", "true").lower() in ("1", "true", "yes")
@@ -0,0 +1,175 @@
+import atexit
+import base64
+import logging
+import os
+import queue
+import re
+import tempfile
+import threading
+import time
+import uuid
+from contextvars import ContextVar
+
+logger = logging.getLogger(__name__)
+
+OFF = "off"
+FAILURE = "failure"
+ALWAYS = "always"
+MODES = (OFF, FAILURE, ALWAYS)
+
+# The writer only ever writes into, and prunes, this subdirectory of the configured
+# directory, and only files named instaartifact-<job id>-<sequence>-<label>.<ext>
+ARTIFACT_SUBDIR = "instaautomation-artifacts"
+ARTIFACT_PREFIX = "instaartifact-"
+ARTIFACT_NAME = re.compile(r"^instaartifact-[A-Za-z0-9_.-]+-\d{2,}-[A-Za-z0-9_.-]+\.(?:png|html)$")
+
+
+class ArtifactWriter:
+    # Decodes and writes screenshots and page sources on a background thread, then
+    # prunes the directory to the retention limits
+    def __init__(self, directory, max_files=200, max_bytes=200 * 1024 * 1024, max_age_seconds=7 * 24 * 3600,
+                 queue_size=32):
+        self.directory = os.path.join(directory, ARTIFACT_SUBDIR)
+        self.max_files = max_files
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def submit(self, name, payload, encoding=None):
+        # payload is a base64 PNG (encoding="base64") or text; never blocks the caller
+        self._start()
+        try:
+            self._queue.put_nowait((name, payload, encoding))
+            return True
+        except queue.Full:
+            logger.warning("Debug artifact queue is full, dropping %s", name)
+            return False
+
+    def flush(self, timeout=5):
+        if self._thread is None:
+            return
+        deadline = time.time() + timeout
+        while self._queue.unfinished_tasks and time.time() < deadline:
+            time.sleep(0.05)
+
+    def _start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="debug-artifacts", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            name, payload, encoding = self._queue.get()
+            try:
+                self._write(name, payload, encoding)
+                self._prune()
+            except Exception as e:
+                logger.warning("Could not write debug artifact %s: %s", name, e)
+            finally:
+                self._queue.task_done()
+
+    def _write(self, name, payload, encoding):
+        data = base64.b64decode(payload) if encoding == "base64" else payload.encode("utf-8")
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=ARTIFACT_PREFIX, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, os.path.join(self.directory, name))
+        logger.debug("Wrote debug artifact %s (%s bytes)", name, len(data))
+
+    def _prune(self):
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and ARTIFACT_NAME.match(entry.name):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        entries.sort(reverse=True)
+
+        now = time.time()
+        kept_files = 0
+        kept_bytes = 0
+        for mtime, size, path in entries:
+            expired = self.max_age_seconds and now - mtime > self.max_age_seconds
+            over = (self.max_files and kept_files >= self.max_files) or \
+                   (self.max_bytes and kept_bytes + size > self.max_bytes)
+            if expired or over:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+                continue
+            kept_files += 1
+            kept_bytes += size
+
+
+def _safe_name(value):
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", str(value))
+
+
+class ArtifactSession:
+    # Names one job's artifacts instaartifact-<job id>-<sequence>-<label>.<ext>
+    def __init__(self, writer, mode, job_id, include_html=True):
+        self.writer = writer
+        self.mode = mode
+        self.job_id = job_id
+        self.include_html = include_html
+        self.sequence = 0
+        self.captured = []
+
+    def wants(self, failure):
+        return self.mode == ALWAYS or (self.mode == FAILURE and failure)
+
+    def capture(self, driver, label, failure=False):
+        if not self.wants(failure):
+            return None
+        self.sequence += 1
+        stem = f"{ARTIFACT_PREFIX}{_safe_name(self.job_id)}-{self.sequence:02d}-{_safe_name(label)}"
+        try:
+            # The browser encodes the PNG; decoding and the disk write happen on the writer thread
+            screenshot = driver.get_screenshot_as_base64()
+        except Exception as e:
+            logger.warning("Could not capture screenshot %s: %s", label, e)
+            return None
+        self.writer.submit(f"{stem}.png", screenshot, encoding="base64")
+        if self.include_html:
+            try:
+                self.writer.submit(f"{stem}.html", driver.page_source)
+            except Exception as e:
+                logger.debug("Could not capture page source %s: %s", label, e)
+        self.captured.append(stem)
+        logger.info("Captured debug artifact %s", stem)
+        return stem
+
+
+_current_session = ContextVar("artifact_session", default=None)
+
+
+def begin_artifacts(writer, mode, job_id=None, include_html=True):
+    session = ArtifactSession(writer, mode, job_id or uuid.uuid4().hex[:12], include_html)
+    _current_session.set(session)
+    return session
+
+
+def current_artifacts():
+    return _current_session.get()
+
+
+def capture(driver, label, failure=False):
+    session = current_artifacts()
+    if session is None or driver is None:
+        return None
+    return session.capture(driver, label, failure)
+
+
+def create_writer(directory, max_files, max_mb, max_age_days):
+    writer = ArtifactWriter(
+        directory,
+        max_files=max_files,
+        max_bytes=max_mb * 1024 * 1024,
+        max_age_seconds=max_age_days * 24 * 3600,
+    )
+    atexit.register(writer.flush)
+    return writer
@@ -0,0 +1,231 @@
+import logging
+import threading
+import time
+
+import psutil
+
+import config
+from automation import setup_driver
+
+logger = logging.getLogger(__name__)
+
+# Origins whose storage is wiped when a driver goes back into the pool
+RESET_ORIGINS = [config.INSTAGRAM_BASE_URL]
+
+
+def driver_rss_bytes(driver):
+    # Resident memory of chromedriver plus every Chrome process it spawned
+    try:
+        root = psutil.Process(driver.service.process.pid)
+        processes = [root] + root.children(recursive=True)
+    except (AttributeError, psutil.Error):
+        return 0
+
+    total = 0
+    for process in processes:
+        try:
+            total += process.memory_info().rss
+        except psutil.Error:
+            continue
+    return total
+
+
+class DriverPool:
+    def __init__(self, size=2, max_uses=20, max_rss_mb=1500, factory=None):
+        self.size = size
+        self.max_uses = max_uses
+        self.max_rss_bytes = max_rss_mb * 1024 * 1024
+        self._factory = factory or setup_driver
+        self._idle = []
+        self._active = set()
+        self._uses = {}
+        self._launching = 0
+        self._cond = threading.Condition()
+        self._started = False
+        self._closed = False
+
+    def start(self):
+        # Launch the idle drivers in the background so startup is not blocked on Chrome
+        with self._cond:
+            if self._started or self._closed:
+                return
+            self._started = True
+            missing = self.size - self._total()
+            self._launching += missing
+
+        for _ in range(missing):
+            threading.Thread(target=self._launch_idle, name="driver-pool-warmup", daemon=True).start()
+
+    def acquire(self, timeout=None):
+        self.start()
+        deadline = time.time() + timeout if timeout is not None else None
+
+        while True:
+            driver = None
+            with self._cond:
+                while True:
+                    if self._closed:
+                        raise RuntimeError("Driver pool is shut down")
+                    if self._idle:
+                        driver = self._idle.pop()
+                        break
+                    if self._total() < self.size:
+                        self._launching += 1
+                        break
+                    remaining = deadline - time.time() if deadline is not None else None
+                    if remaining is not None and remaining <= 0:
+                        raise TimeoutError("Timed out waiting for a free driver")
+                    self._cond.wait(remaining)
+
+            if driver is None:
+                driver = self._launch()
+                if driver is None:
+                    raise RuntimeError("Could not launch a Chrome driver")
+            elif not self._is_healthy(driver):
+                logger.warning("Discarding unhealthy pooled driver")
+                self._discard(driver)
+                continue
+
+            with self._cond:
+                self._active.add(driver)
+            logger.info("Acquired pooled driver (use %s/%s)", self._uses[driver] + 1, self.max_uses)
+            return driver
+
+    def release(self, driver, discard=False):
+        with self._cond:
+            self._active.discard(driver)
+            self._uses[driver] = self._uses.get(driver, 0) + 1
+            uses = self._uses[driver]
+
+        if not discard and uses >= self.max_uses:
+            logger.info("Recycling driver after %s uses", uses)
+            discard = True
+
+        if not discard:
+            rss = driver_rss_bytes(driver)
+            if rss > self.max_rss_bytes:
+                logger.info("Recycling driver using %.0f MB", rss / (1024 * 1024))
+                discard = True
+
+        if not discard and not self._reset(driver):
+            discard = True
+
+        if discard:
+            self._discard(driver)
+            self._replenish()
+            return
+
+        with self._cond:
+            if self._closed:
+                closed = True
+            else:
+                closed = False
+                self._idle.append(driver)
+                self._cond.notify()
+        if closed:
+            self._quit(driver)
+
+    def stats(self):
+        with self._cond:
+            return {
+                "size": self.size,
+                "idle": len(self._idle),
+                "active": len(self._active),
+                "launching": self._launching,
+            }
+
+    def rss_bytes(self):
+        with self._cond:
+            drivers = self._idle + list(self._active)
+        return sum(driver_rss_bytes(driver) for driver in drivers)
+
+    def shutdown(self):
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            drivers = self._idle + list(self._active)
+            self._idle = []
+            self._active.clear()
+            self._cond.notify_all()
+
+        logger.info("Shutting down driver pool (%s drivers)", len(drivers))
+        for driver in drivers:
+            self._quit(driver)
+
+    def _total(self):
+        return len(self._idle) + len(self._active) + self._launching
+
+    def _launch(self):
+        # Caller has already reserved a slot by incrementing _launching
+        driver = None
+        try:
+            driver = self._factory()
+        except Exception as e:
+            logger.error("Failed to launch pooled driver: %s", e)
+        with self._cond:
+            self._launching -= 1
+            if driver is not None:
+                self._uses[driver] = 0
+            self._cond.notify()
+        return driver
+
+    def _launch_idle(self):
+        driver = self._launch()
+        if driver is None:
+            return
+        with self._cond:
+            if not self._closed:
+                self._idle.append(driver)
+                self._cond.notify()
+                return
+        self._quit(driver)
+
+    def _replenish(self):
+        with self._cond:
+            if self._closed or self._total() >= self.size:
+                return
+            self._launching += 1
+        threading.Thread(target=self._launch_idle, name="driver-pool-replenish", daemon=True).start()
+
+    def _is_healthy(self, driver):
+        try:
+            return driver.execute_script("return 1;") == 1
+        except Exception as e:
+            logger.warning("Driver health check failed: %s", e)
+            return False
+
+    def _reset(self, driver):
+        try:
+            # Close any extra tabs the job left behind
+            handles = driver.window_handles
+            for handle in handles[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(handles[0])
+
+            driver.execute_script("try { window.localStorage.clear(); window.sessionStorage.clear(); } catch (e) {}")
+            try:
+                driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+                for origin in RESET_ORIGINS:
+                    driver.execute_cdp_cmd("Storage.clearDataForOrigin", {"origin": origin, "storageTypes": "all"})
+            except Exception:
+                driver.delete_all_cookies()
+
+            driver.get("about:blank")
+            return True
+        except Exception as e:
+            logger.warning("Failed to reset pooled driver: %s", e)
+            return False
+
+    def _discard(self, driver):
+        with self._cond:
+            self._uses.pop(driver, None)
+            self._cond.notify()
+        self._quit(driver)
+
+    def _quit(self, driver):
+        try:
+            driver.quit()
+        except Exception as e:
+            logger.warning("Error quitting driver: %s", e)
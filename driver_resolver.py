@@ -0,0 +1,117 @@
+import functools
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+
+from webdriver_manager.chrome import ChromeDriverManager
+from webdriver_manager.core.os_manager import ChromeType, OperationSystemManager
+
+import config
+
+logger = logging.getLogger(__name__)
+
+# Default Chrome install locations used when ChromeDriverManager is unavailable
+CHROME_BINARY_PATHS = {
+    "win32": r"C:\Program Files\Google\Chrome\Application\chrome.exe",
+    "darwin": "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
+    "linux": "/usr/bin/google-chrome",
+}
+
+_lock = threading.Lock()
+_resolved = None
+
+
+def detect_chrome_version():
+    try:
+        return OperationSystemManager().get_browser_version_from_os(ChromeType.GOOGLE)
+    except Exception as e:
+        logger.warning("Could not detect Chrome version: %s", e)
+        return None
+
+
+@functools.lru_cache(maxsize=None)
+def find_chrome_binary():
+    chrome_path = CHROME_BINARY_PATHS.get(sys.platform)
+    if chrome_path and os.path.exists(chrome_path):
+        return chrome_path
+    return None
+
+
+def _load_manifest(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _save_manifest(path, manifest):
+    # Write to a temp file and rename so concurrent processes never read a partial manifest
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".chromedriver-", suffix=".json")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning("Could not write driver manifest %s: %s", path, e)
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
+def _manifest_is_valid(manifest, chrome_version):
+    if not manifest or not manifest.get("driver_path"):
+        return False
+    if not os.path.exists(manifest["driver_path"]):
+        logger.info("Cached ChromeDriver binary is missing")
+        return False
+    if chrome_version and manifest.get("chrome_version") != chrome_version:
+        logger.info("Chrome version changed from %s to %s", manifest.get('chrome_version'), chrome_version)
+        return False
+    return True
+
+
+def resolve_chromedriver(force=False, manifest_path=None):
+    global _resolved
+    manifest_path = manifest_path or config.DRIVER_MANIFEST_PATH
+
+    with _lock:
+        # Within one process only the binary's existence is rechecked
+        if not force and _resolved and os.path.exists(_resolved["driver_path"]):
+            return _resolved
+
+        chrome_version = detect_chrome_version()
+        manifest = None if force else _load_manifest(manifest_path)
+
+        if _manifest_is_valid(manifest, chrome_version):
+            logger.info("Using cached ChromeDriver: %s", manifest['driver_path'])
+        else:
+            logger.info("Resolving ChromeDriver with ChromeDriverManager")
+            manifest = {
+                "driver_path": ChromeDriverManager().install(),
+                "chrome_version": chrome_version,
+                "resolved_at": time.time(),
+            }
+            _save_manifest(manifest_path, manifest)
+
+        _resolved = manifest
+        return manifest
+
+
+def invalidate_chromedriver(manifest_path=None):
+    global _resolved
+    manifest_path = manifest_path or config.DRIVER_MANIFEST_PATH
+
+    with _lock:
+        _resolved = None
+        try:
+            os.remove(manifest_path)
+        except OSError:
+            pass
@@ -0,0 +1,40 @@
+import threading
+from contextlib import contextmanager
+
+
+class DriverTracker:
+    # Chrome drivers a job launched for itself (no pool), so the capacity
+    # metrics count them next to the pooled ones
+    def __init__(self):
+        self._active = set()
+        self._launching = 0
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def launching(self):
+        with self._lock:
+            self._launching += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._launching -= 1
+
+    def add(self, driver):
+        with self._lock:
+            self._active.add(driver)
+
+    def discard(self, driver):
+        with self._lock:
+            self._active.discard(driver)
+
+    def drivers(self):
+        with self._lock:
+            return list(self._active)
+
+    def stats(self):
+        with self._lock:
+            return {"idle": 0, "active": len(self._active), "launching": self._launching}
+
+
+UNPOOLED_DRIVERS = DriverTracker()
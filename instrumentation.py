@@ -0,0 +1,97 @@
+import logging
+import os
+import sys
+import threading
+import time
+
+import selenium
+
+from tracing import current_trace
+
+logger = logging.getLogger(__name__)
+
+_SELENIUM_DIR = os.path.dirname(os.path.abspath(selenium.__file__))
+_THIS_FILE = os.path.abspath(__file__)
+
+# Commands issued by helpers (waits, selector probes) are blamed on the line in
+# these modules that called the helper, which is where the cost is decided
+PREFERRED_CALLER_MODULES = ("automation", "like_engine")
+
+
+def find_caller(depth_limit=30):
+    # e.g. "automation.like_posts:412"
+    frame = sys._getframe(2)
+    first = None
+    for _ in range(depth_limit):
+        if frame is None:
+            break
+        filename = os.path.abspath(frame.f_code.co_filename)
+        if filename != _THIS_FILE and not filename.startswith(_SELENIUM_DIR):
+            module = os.path.splitext(os.path.basename(filename))[0]
+            caller = f"{module}.{frame.f_code.co_name}:{frame.f_lineno}"
+            if module in PREFERRED_CALLER_MODULES:
+                return caller
+            first = first or caller
+        frame = frame.f_back
+    return first or "unknown"
+
+
+class CommandStats:
+    # Process-wide aggregates of WebDriver commands by command name and caller
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}
+
+    def record(self, command, caller, seconds, error=None):
+        with self._lock:
+            entry = self._entries.get((command, caller))
+            if entry is None:
+                entry = self._entries[(command, caller)] = {
+                    "count": 0,
+                    "errors": 0,
+                    "seconds": 0.0,
+                    "max_seconds": 0.0,
+                }
+            entry["count"] += 1
+            entry["seconds"] += seconds
+            entry["max_seconds"] = max(entry["max_seconds"], seconds)
+            if error:
+                entry["errors"] += 1
+
+    def snapshot(self):
+        with self._lock:
+            return [
+                dict(entry, command=command, caller=caller)
+                for (command, caller), entry in self._entries.items()
+            ]
+
+
+COMMAND_STATS = CommandStats()
+
+
+def instrument_driver(driver, stats=COMMAND_STATS):
+    # Every WebDriver call (find_elements, click, execute_script, current_url, ...)
+    # goes through driver.execute, so wrapping it on the instance sees them all
+    if getattr(driver, "_instrumented", False):
+        return driver
+    original_execute = driver.execute
+
+    def execute(driver_command, params=None):
+        caller = find_caller()
+        started = time.perf_counter()
+        error = None
+        try:
+            return original_execute(driver_command, params)
+        except Exception as e:
+            error = type(e).__name__
+            raise
+        finally:
+            seconds = time.perf_counter() - started
+            stats.record(driver_command, caller, seconds, error)
+            trace = current_trace()
+            if trace:
+                trace.record_command(driver_command, caller, seconds, error)
+
+    driver.execute = execute
+    driver._instrumented = True
+    return driver
@@ -0,0 +1,78 @@
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# Events kept per job; older ones are dropped first and a late reader starts from the oldest kept
+MAX_EVENTS = 1000
+
+
+class EventLog:
+    # Ordered progress events of one job. Writers append from the worker thread;
+    # readers block until an event newer than the last one they saw arrives.
+    def __init__(self, max_events=MAX_EVENTS):
+        self.max_events = max_events
+        self._events = []
+        self._next_id = 1
+        self._closed = False
+        self._condition = threading.Condition()
+
+    def emit(self, event, **data):
+        with self._condition:
+            if self._closed:
+                return None
+            entry = {"id": self._next_id, "event": event, "ts": round(time.time(), 3), "data": data}
+            self._next_id += 1
+            self._events.append(entry)
+            if len(self._events) > self.max_events:
+                del self._events[0]
+            self._condition.notify_all()
+            return entry
+
+    def close(self):
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+    @property
+    def closed(self):
+        return self._closed
+
+    def read(self, after=0, timeout=15):
+        # Returns (events newer than `after`, closed); waits up to timeout when there are none
+        with self._condition:
+            self._condition.wait_for(lambda: self._closed or self._newer(after), timeout)
+            return self._newer(after), self._closed
+
+    def _newer(self, after):
+        return [entry for entry in self._events if entry["id"] > after]
+
+
+_current_log = ContextVar("job_event_log", default=None)
+
+
+@contextmanager
+def bind_events(log):
+    token = _current_log.set(log)
+    try:
+        yield log
+    finally:
+        _current_log.reset(token)
+
+
+def emit(event, **data):
+    # No-op outside a job (benchmarks, scripts)
+    log = _current_log.get()
+    if log is not None:
+        log.emit(event, **data)
+
+
+@contextmanager
+def stage(name, **data):
+    # Reports a phase as it starts and when it finishes, with its wall time
+    emit("phase", name=name, status="started", **data)
+    started = time.time()
+    try:
+        yield
+    finally:
+        emit("phase", name=name, status="finished", seconds=round(time.time() - started, 3), **data)
@@ -0,0 +1,149 @@
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from job_events import EventLog, bind_events
+from log_setup import job_context
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+FINISHED = "finished"
+FAILED = "failed"
+
+
+class QueueFullError(Exception):
+    pass
+
+
+def _serialize(value):
+    # Job functions may return result objects (or lists of them) with a to_dict
+    if isinstance(value, list):
+        return [_serialize(item) for item in value]
+    return value.to_dict() if hasattr(value, "to_dict") else value
+
+
+class Job:
+    def __init__(self, target_username, targets=None):
+        self.id = uuid.uuid4().hex
+        self.target_username = target_username
+        # Batch jobs work through several profiles and report each one as it finishes
+        self.targets = targets
+        self.results = []
+        # Progress stream for /jobs/<id>/events, closed once the job is done
+        self.events = EventLog()
+        self.state = QUEUED
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.result = None
+        self.error = None
+
+    def add_result(self, result):
+        self.results.append(result)
+
+    def to_dict(self):
+        queue_seconds = None
+        run_seconds = None
+        if self.started_at:
+            queue_seconds = round(self.started_at - self.created_at, 3)
+            run_seconds = round((self.finished_at or time.time()) - self.started_at, 3)
+
+        return {
+            "id": self.id,
+            "target_username": self.target_username,
+            "state": self.state,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "queue_seconds": queue_seconds,
+            "run_seconds": run_seconds,
+            "result": _serialize(self.result),
+            "error": self.error,
+            "retryable": self.retryable,
+            "targets": self.targets,
+            "results": _serialize(list(self.results)),
+        }
+
+    @property
+    def retryable(self):
+        # Whether submitting the same request again could turn out differently: a job
+        # that crashed could, and so could one where any target reported a retryable outcome
+        if self.state == FAILED:
+            return True
+        results = self.result if isinstance(self.result, list) else [self.result]
+        return any(getattr(result, "retryable", False) for result in results)
+
+
+class JobQueue:
+    def __init__(self, max_workers=2, max_pending=20, history_size=100):
+        # The worker count is also the cap on concurrently running Chrome sessions
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="automation-job")
+        self._max_pending = max_pending
+        self._history_size = history_size
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, func, *args, target_username=None, targets=None, report_results=False, **kwargs):
+        # With report_results, func is called with on_result=job.add_result so
+        # per-target results show up on the job while it is still running
+        with self._lock:
+            pending = sum(1 for job in self._jobs.values() if job.state == QUEUED)
+            if pending >= self._max_pending:
+                raise QueueFullError(f"Too many pending jobs ({pending})")
+
+            job = Job(target_username, targets)
+            self._jobs[job.id] = job
+            self._trim_history()
+
+        if report_results:
+            kwargs["on_result"] = job.add_result
+        job.events.emit("state", state=QUEUED)
+        logger.info("Queued job %s for target: %s", job.id, ", ".join(targets) if targets else target_username)
+        self._executor.submit(self._run, job, func, args, kwargs)
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list(self):
+        with self._lock:
+            return list(reversed(self._jobs.values()))
+
+    def shutdown(self, wait=False):
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+    def _run(self, job, func, args, kwargs):
+        # Everything the job logs on this worker thread carries its id
+        with job_context(job.id, job.target_username), bind_events(job.events):
+            job.state = RUNNING
+            job.started_at = time.time()
+            job.events.emit("state", state=RUNNING)
+            logger.info("Starting job %s", job.id)
+            try:
+                job.result = func(*args, **kwargs)
+                job.state = FINISHED
+            except Exception as e:
+                logger.exception("Job %s failed: %s", job.id, e)
+                job.error = str(e)
+                job.state = FAILED
+            finally:
+                job.finished_at = time.time()
+                logger.info("Job %s %s in %.2f seconds", job.id, job.state, job.finished_at - job.started_at)
+                job.events.emit("done", **job.to_dict())
+                job.events.close()
+
+    def _trim_history(self):
+        # Drop the oldest completed jobs once the history is full
+        while len(self._jobs) > self._history_size:
+            for job_id, job in self._jobs.items():
+                if job.state in (FINISHED, FAILED):
+                    del self._jobs[job_id]
+                    break
+            else:
+                break
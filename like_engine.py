@@ -0,0 +1,520 @@
+import logging
+import time
+from contextlib import contextmanager
+
+from selenium.common.exceptions import StaleElementReferenceException
+from selenium.webdriver.common.action_chains import ActionChains
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+
+from debug_artifacts import capture
+from job_events import emit
+from post_harvester import harvest_post_urls, is_post_url
+from tracing import current_trace, end_phase, phase, start_phase
+from waits import wait_for_page, wait_for_presence, wait_for_url_change, wait_until
+
+logger = logging.getLogger(__name__)
+
+# Per-post outcomes
+LIKED = "liked"
+ALREADY_LIKED = "already_liked"
+NOT_OPENED = "not_opened"
+NO_BUTTON = "no_button"
+CLICK_FAILED = "click_failed"
+UNCHANGED = "unchanged"
+UNVERIFIED = "unverified"
+BUDGET_EXHAUSTED = "budget_exhausted"
+ERROR = "error"
+
+# Outcomes worth a failure screenshot
+FAILED_OUTCOMES = (NOT_OPENED, NO_BUTTON, CLICK_FAILED, UNCHANGED, UNVERIFIED, ERROR)
+
+# Verification states; LIKED and UNCHANGED double as post outcomes
+UNKNOWN = "unknown"
+
+# Seconds to wait for the post's action bar before falling back to the like button locators
+PRECHECK_TIMEOUT = 3
+
+LIKE_CLASS_XPATH = (
+    "contains(@class, '_acan') or contains(@class, '_abl-') or contains(@class, '_aacl') "
+    "or contains(@class, '_aaco') or contains(@class, '_aacw')"
+)
+
+# Reads the post's own Like/Unlike control in one round trip. Comment likes live
+# in list items, so they are skipped; the action bar section is checked first.
+LIKE_STATE_SCRIPT = """
+var article = document.querySelector('article');
+if (!article) {
+    return null;
+}
+var selector = '[aria-label="Like"], [aria-label="Unlike"]';
+var scoped = 'section [aria-label="Like"], section [aria-label="Unlike"]';
+var candidates = Array.prototype.slice.call(article.querySelectorAll(scoped))
+    .concat(Array.prototype.slice.call(article.querySelectorAll(selector)));
+for (var i = 0; i < candidates.length; i++) {
+    var node = candidates[i];
+    if (node.closest('li')) {
+        continue;
+    }
+    var button = node.closest('button, [role="button"]');
+    if (!button) {
+        continue;
+    }
+    return {liked: node.getAttribute('aria-label') === 'Unlike', button: button};
+}
+return null;
+"""
+
+
+# Reads the like state from the button's own subtree only. Elements inside a list
+# item belong to comments, the same rule LIKE_STATE_SCRIPT applies, and read as unknown.
+VERIFY_LIKE_SCRIPT = """
+var button = arguments[0];
+var label = null;
+if (button && button.isConnected && !button.closest('li')) {
+    label = button.getAttribute('aria-label');
+    if (label !== 'Like' && label !== 'Unlike') {
+        var inner = button.querySelector('[aria-label="Like"], [aria-label="Unlike"]');
+        label = inner ? inner.getAttribute('aria-label') : null;
+    }
+}
+return label === 'Unlike' ? 'liked' : (label === 'Like' ? 'unchanged' : 'unknown');
+"""
+
+
+# Keeps the elements that are, or contain, a link to a post or reel
+POST_ELEMENTS_SCRIPT = """
+return arguments[0].filter(function (element) {
+    var link = element.matches('a[href*="/p/"], a[href*="/reel/"]')
+        ? element : element.querySelector('a[href*="/p/"], a[href*="/reel/"]');
+    return !!link;
+});
+"""
+
+
+def read_like_state(driver):
+    # {"liked": bool, "button": WebElement}, or None when the state can't be read
+    try:
+        return driver.execute_script(LIKE_STATE_SCRIPT)
+    except Exception as e:
+        logger.warning("Error reading like state: %s", e)
+        return None
+
+
+def wait_for_like_state(driver, timeout=3):
+    # Polls the like-state probe until the action bar has rendered; None if it
+    # never does within the timeout
+    state = [None]
+
+    def readable(driver):
+        state[0] = read_like_state(driver)
+        return state[0] is not None
+
+    wait_until(driver, readable, timeout)
+    return state[0]
+
+
+def read_button_state(driver, button):
+    # "liked", "unchanged" or "unknown"; a re-rendered button falls back to the article probe
+    try:
+        return driver.execute_script(VERIFY_LIKE_SCRIPT, button)
+    except StaleElementReferenceException:
+        state = read_like_state(driver)
+        if state is None:
+            return UNKNOWN
+        return LIKED if state.get("liked") else UNCHANGED
+    except Exception as e:
+        logger.warning("Error verifying like state: %s", e)
+        return UNKNOWN
+
+
+def _click_first(elements):
+    for element in elements:
+        try:
+            element.click()
+            return True
+        except Exception:
+            continue
+    return False
+
+
+def click_direct(driver, button):
+    for _ in range(3):
+        try:
+            button.click()
+            return True
+        except Exception as e:
+            logger.debug("Direct click attempt failed: %s", e)
+            wait_until(driver, EC.element_to_be_clickable(button), 2)
+    return False
+
+
+def click_javascript(driver, button):
+    driver.execute_script("arguments[0].click();", button)
+    return True
+
+
+def click_action_chains(driver, button):
+    ActionChains(driver).move_to_element(button).click().perform()
+    return True
+
+
+def click_parent_button(driver, button):
+    button.find_element(By.XPATH, "./ancestor::button").click()
+    return True
+
+
+def click_clickable_ancestor(driver, button):
+    button.find_element(By.XPATH, "./ancestor::*[@role='button' or @onclick or contains(@class, '_acan')]").click()
+    return True
+
+
+def click_any_button(driver, button):
+    return _click_first(driver.find_elements(By.TAG_NAME, "button"))
+
+
+def click_article_position(driver, button):
+    # The like button is typically one of the first few buttons in the article
+    article = driver.find_element(By.TAG_NAME, "article")
+    return _click_first(article.find_elements(By.TAG_NAME, "button")[:3])
+
+
+def click_like_text(driver, button):
+    for element in driver.find_elements(By.XPATH, "//*[contains(text(), 'Like')]"):
+        try:
+            element.find_element(By.XPATH, "./ancestor::button").click()
+            return True
+        except Exception:
+            continue
+    return False
+
+
+def click_like_container(driver, button):
+    return _click_first(driver.find_elements(
+        By.XPATH, "//div[contains(@class, '_aacl') or contains(@class, '_aaco') or contains(@class, '_aacw')]"
+    ))
+
+
+def click_like_class(driver, button):
+    return _click_first(driver.find_elements(By.XPATH, f"//*[{LIKE_CLASS_XPATH}]"))
+
+
+def click_article_like_class(driver, button):
+    article = driver.find_element(By.TAG_NAME, "article")
+    elements = article.find_elements(By.XPATH, f".//*[{LIKE_CLASS_XPATH}]")
+    return _click_first(elements or article.find_elements(By.TAG_NAME, "button"))
+
+
+def click_article_anything(driver, button):
+    article = driver.find_element(By.TAG_NAME, "article")
+    return _click_first(article.find_elements(By.XPATH, ".//*"))
+
+
+# Tried in order until one reports a click; these only ever click the located button
+# or one of its ancestors
+CLICK_STRATEGIES = [
+    ("direct", click_direct),
+    ("javascript", click_javascript),
+    ("action_chains", click_action_chains),
+    ("parent_button", click_parent_button),
+    ("clickable_ancestor", click_clickable_ancestor),
+]
+
+# Last resorts that click whatever matches a broad query, which can hit Unlike, Share,
+# Comment or anything else on the page
+BROAD_CLICK_STRATEGIES = [
+    ("any_button", click_any_button),
+    ("article_position", click_article_position),
+    ("like_text", click_like_text),
+    ("like_container", click_like_container),
+    ("like_class", click_like_class),
+    ("article_like_class", click_article_like_class),
+    ("article_anything", click_article_anything),
+]
+
+
+def _command_count():
+    trace = current_trace()
+    return trace.command_count if trace else 0
+
+
+class Budget:
+    # Wall-time and WebDriver-command allowance; 0 or None leaves a limit off.
+    # A child budget is also exhausted when its parent is.
+    def __init__(self, name, seconds=None, commands=None, parent=None):
+        self.name = name
+        self.seconds = seconds or None
+        self.commands = commands or None
+        self.parent = parent
+        self.started = time.time()
+        self.commands_at_start = _command_count()
+
+    def remaining_seconds(self):
+        remaining = None
+        if self.seconds:
+            remaining = self.seconds - (time.time() - self.started)
+        if self.parent:
+            parent_remaining = self.parent.remaining_seconds()
+            if parent_remaining is not None:
+                remaining = parent_remaining if remaining is None else min(remaining, parent_remaining)
+        return remaining
+
+    def cap(self, timeout):
+        remaining = self.remaining_seconds()
+        return timeout if remaining is None else max(0, min(timeout, remaining))
+
+    def exhausted(self):
+        # The reason the budget ran out, e.g. "post_time_budget", or None
+        if self.parent:
+            reason = self.parent.exhausted()
+            if reason:
+                return reason
+        if self.seconds and time.time() - self.started >= self.seconds:
+            return f"{self.name}_time_budget"
+        if self.commands and _command_count() - self.commands_at_start >= self.commands:
+            return f"{self.name}_command_budget"
+        return None
+
+
+class LikePipeline:
+    # Runs each post through discover -> open -> precheck -> locate -> click -> verify
+    # exactly once, timing every stage as a trace phase
+    def __init__(self, driver, like_selectors, post_selectors, pacing, max_posts=10,
+                 direct_navigation=True, click_strategies=None, broad_clicks=False,
+                 job_budget=None, post_seconds=None, post_commands=None):
+        self.driver = driver
+        self.like_selectors = like_selectors
+        self.post_selectors = post_selectors
+        self.pacing = pacing
+        self.max_posts = max_posts
+        self.direct_navigation = direct_navigation
+        self.click_strategies = click_strategies or (
+            CLICK_STRATEGIES + BROAD_CLICK_STRATEGIES if broad_clicks else CLICK_STRATEGIES
+        )
+        self.job_budget = job_budget or Budget("job")
+        self.post_seconds = post_seconds
+        self.post_commands = post_commands
+        self.stop_reason = None
+        self.found = 0
+        self.results = []
+
+    @property
+    def liked_count(self):
+        return sum(1 for result in self.results if result["outcome"] == LIKED)
+
+    def counts(self):
+        # Posts liked, skipped (already liked, out of budget or never reached) and failed
+        processed = min(self.found, self.max_posts)
+        outcomes = [result["outcome"] for result in self.results]
+        failed = sum(1 for outcome in outcomes if outcome in FAILED_OUTCOMES)
+        liked = outcomes.count(LIKED)
+        return {"liked": liked, "skipped": processed - liked - failed, "failed": failed}
+
+    def run(self):
+        targets, by_url = self.discover()
+        self.found = len(targets)
+        emit("posts_discovered", count=len(targets), processing=min(len(targets), self.max_posts))
+        if not targets:
+            logger.error("No posts found on the profile page")
+            capture(self.driver, "no_posts", failure=True)
+            return self.results
+
+        # Element targets are opened by clicking, so the grid has to be restored after each one
+        go_back = not (by_url and self.direct_navigation)
+        logger.info("Found %s posts to process", len(targets))
+        for i, target in enumerate(targets[:self.max_posts]):
+            self.stop_reason = self.job_budget.exhausted()
+            if self.stop_reason:
+                logger.warning("Stopping after %s posts: %s exhausted", i, self.stop_reason)
+                break
+            if i > 0:
+                self.pacing.pause("between_posts")
+            started = time.time()
+            result = self.process(i, target, go_back)
+            result["seconds"] = round(time.time() - started, 4)
+            self.results.append(result)
+            emit("post", **result)
+
+        logger.info("Finished liking posts. Total liked: %s", self.liked_count)
+        return self.results
+
+    def discover(self):
+        # Scroll only until enough post links have loaded or the grid stops growing
+        logger.debug("Scrolling to load posts")
+        post_urls = [post["url"] for post in harvest_post_urls(self.driver, max_posts=self.max_posts)]
+        if post_urls:
+            return post_urls, True
+
+        # Without rendered links, fall back to clicking grid elements, but only ones that
+        # hold a post or reel link: the broad selectors also match Follow and other controls
+        try:
+            with phase("discover"):
+                match = self.post_selectors.probe(self.driver)
+                elements = self.driver.execute_script(POST_ELEMENTS_SCRIPT, match.elements) if match else None
+            if elements:
+                return elements, False
+        except Exception as e:
+            logger.warning("Error probing post selectors: %s", e)
+        return [], False
+
+    def process(self, index, target, go_back):
+        result = {"index": index, "url": target if isinstance(target, str) else None,
+                  "outcome": ERROR, "click_strategy": None, "verification": None,
+                  "stop_reason": None, "stages": {}}
+        like_span = start_phase("like")
+        budget = Budget("post", self.post_seconds, self.post_commands, parent=self.job_budget)
+        origin_url = None
+        try:
+            origin_url = self.driver.current_url
+            with self._stage(result, "open"):
+                opened = self.open(target, origin_url, budget)
+            if not opened:
+                result["outcome"] = NOT_OPENED
+                return result
+            result["url"] = self.driver.current_url
+            if self._out_of_budget(result, budget):
+                return result
+
+            # The probe tells whether the post is already liked and usually yields the button too
+            with self._stage(result, "precheck"):
+                state = wait_for_like_state(self.driver, budget.cap(PRECHECK_TIMEOUT))
+            if state and state.get("liked"):
+                logger.info("Post %s is already liked, skipping", index + 1)
+                result["outcome"] = ALREADY_LIKED
+                return result
+
+            button = state.get("button") if state else None
+            if button is None:
+                if self._out_of_budget(result, budget):
+                    return result
+                with self._stage(result, "locate"):
+                    button = self.locate(budget)
+                    # Broad locators can also match Unlike, Comment or Share; only click
+                    # an element that reads as an unliked Like control
+                    button_state = read_button_state(self.driver, button) if button is not None else None
+                if button_state == LIKED:
+                    logger.info("Post %s is already liked, skipping", index + 1)
+                    result["outcome"] = ALREADY_LIKED
+                    return result
+                if button_state == UNKNOWN:
+                    logger.warning("Located element on post %s is not a like control, not clicking", index + 1)
+                    button = None
+            if button is None:
+                logger.warning("Could not find like button for post %s", index + 1)
+                result["outcome"] = NO_BUTTON
+                return result
+
+            with self._stage(result, "click"):
+                result["click_strategy"], result["stop_reason"] = self.click(button, budget)
+            if not result["click_strategy"]:
+                result["outcome"] = BUDGET_EXHAUSTED if result["stop_reason"].endswith("_budget") else CLICK_FAILED
+                return result
+            if self._out_of_budget(result, budget):
+                result["outcome"] = UNVERIFIED
+                return result
+
+            with self._stage(result, "verify"):
+                verification = self.verify(button, budget.cap(5))
+            result["verification"] = verification
+            if verification == LIKED:
+                result["outcome"] = LIKED
+                logger.info("Successfully liked post %s, total liked: %s", index + 1, self.liked_count + 1)
+            elif verification == UNCHANGED:
+                result["outcome"] = UNCHANGED
+                logger.warning("Like button on post %s did not change after clicking", index + 1)
+            else:
+                result["outcome"] = UNVERIFIED
+                logger.warning("Could not read the like state of post %s", index + 1)
+            return result
+        except Exception as e:
+            logger.error("Error processing post %s: %s", index + 1, e)
+            return result
+        finally:
+            if result["outcome"] in FAILED_OUTCOMES:
+                capture(self.driver, f"post{index + 1}_{result['outcome']}", failure=True)
+            if go_back and origin_url and self._current_url() != origin_url:
+                self._back()
+            end_phase(like_span)
+
+    def open(self, target, origin_url, budget):
+        if isinstance(target, str):
+            logger.debug("Navigating directly to post URL: %s", target)
+            self.driver.get(target)
+        else:
+            logger.debug("Clicking post to navigate to it")
+            target.click()
+            wait_for_url_change(self.driver, origin_url, budget.cap(10))
+
+        new_url = self.driver.current_url
+        if not is_post_url(new_url) or new_url == origin_url:
+            return False
+        if not wait_for_presence(self.driver, (By.TAG_NAME, "article"), budget.cap(10)):
+            logger.warning("Post did not load")
+            return False
+        return True
+
+    def locate(self, budget):
+        # Every like button strategy in one probe per poll, sharing one timeout
+        match = self.like_selectors.wait(self.driver, budget.cap(5))
+        if not match:
+            return None
+        logger.debug("Found like button by %s", match.locator.name)
+        return match.element
+
+    def click(self, button, budget):
+        # Returns the strategy that clicked, or None with the reason the cascade stopped
+        for name, strategy in self.click_strategies:
+            reason = budget.exhausted()
+            if reason:
+                logger.warning("Stopping click cascade before %s: %s exhausted", name, reason)
+                return None, reason
+            try:
+                if strategy(self.driver, button):
+                    logger.debug("Clicked like button using %s", name)
+                    return name, None
+            except Exception as e:
+                logger.debug("Click strategy %s failed: %s", name, e)
+        return None, "strategies_exhausted"
+
+    def verify(self, button, timeout=5):
+        # One script per poll, scoped to the button that was clicked
+        last = [UNKNOWN]
+
+        def liked(driver):
+            last[0] = read_button_state(driver, button)
+            return last[0] == LIKED
+
+        wait_until(self.driver, liked, timeout)
+        return last[0]
+
+    def _out_of_budget(self, result, budget):
+        reason = budget.exhausted()
+        if not reason:
+            return False
+        logger.warning("Giving up on post %s: %s exhausted", result['index'] + 1, reason)
+        result["outcome"] = BUDGET_EXHAUSTED
+        result["stop_reason"] = reason
+        return True
+
+    @contextmanager
+    def _stage(self, result, name):
+        # A trace phase that also records its duration on the per-post result
+        started = time.time()
+        with phase(name):
+            try:
+                yield
+            finally:
+                result["stages"][name] = round(time.time() - started, 4)
+
+    def _current_url(self):
+        try:
+            return self.driver.current_url
+        except Exception:
+            return None
+
+    def _back(self):
+        try:
+            self.driver.back()
+            wait_for_page(self.driver)
+        except Exception as e:
+            logger.warning("Error returning to profile: %s", e)
@@ -0,0 +1,141 @@
+import atexit
+import copy
+import json
+import logging
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from logging.handlers import QueueHandler, QueueListener
+
+# Job the current thread is working on, attached to every record it logs
+_job_context = ContextVar("log_job_context", default=None)
+
+# Record attributes that are not user-supplied extras
+_STANDARD_ATTRS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "job_id", "target"}
+
+_listener = None
+_lock = threading.Lock()
+
+
+@contextmanager
+def job_context(job_id, target=None):
+    token = _job_context.set({"job_id": job_id, "target": target})
+    try:
+        yield
+    finally:
+        _job_context.reset(token)
+
+
+def current_job_id():
+    context = _job_context.get()
+    return context["job_id"] if context else None
+
+
+class JobContextFilter(logging.Filter):
+    # Runs in the logging thread's caller, where the job context is visible
+    def filter(self, record):
+        context = _job_context.get()
+        record.job_id = context["job_id"] if context else None
+        record.target = context["target"] if context else None
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    # DEBUG records from hot loops: the first `first` of each message template per
+    # job pass, then one in every `every`. Templates are only comparable because
+    # messages are formatted lazily.
+    def __init__(self, first=5, every=20, max_keys=10000):
+        super().__init__()
+        self.first = first
+        self.every = every
+        self.max_keys = max_keys
+        self._counts = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        if record.levelno > logging.DEBUG or self.every <= 0:
+            return True
+        key = (getattr(record, "job_id", None), record.name, record.msg)
+        with self._lock:
+            if len(self._counts) >= self.max_keys:
+                self._counts.clear()
+            count = self._counts.get(key, 0) + 1
+            self._counts[key] = count
+        if count <= self.first:
+            return True
+        if (count - self.first) % self.every == 0:
+            record.sampled = count
+            return True
+        return False
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            "ts": round(record.created, 3),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(record.created)),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if getattr(record, "job_id", None):
+            entry["job_id"] = record.job_id
+        if getattr(record, "target", None):
+            entry["target"] = record.target
+        for name, value in vars(record).items():
+            if name not in _STANDARD_ATTRS and not name.startswith("_"):
+                entry[name] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    def __init__(self):
+        super().__init__("%(asctime)s - %(levelname)s - %(job)s%(message)s")
+
+    def format(self, record):
+        record.job = f"[{record.job_id[:8]}] " if getattr(record, "job_id", None) else ""
+        return super().format(record)
+
+
+class _QueueHandler(QueueHandler):
+    # Resolves the message and traceback text in the caller, but keeps them as
+    # separate fields for the formatter
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def configure_logging(level="INFO", fmt="json", levels=None, sample_first=5, sample_every=20):
+    # Records are handed to a queue in the calling thread and written by a
+    # listener thread, so log I/O never blocks a Selenium worker
+    global _listener
+    with _lock:
+        if _listener is not None:
+            return
+        stream = logging.StreamHandler()
+        stream.setFormatter(JsonFormatter() if fmt == "json" else TextFormatter())
+
+        handler = _QueueHandler(queue.SimpleQueue())
+        handler.addFilter(JobContextFilter())
+        handler.addFilter(SamplingFilter(sample_first, sample_every))
+
+        root = logging.getLogger()
+        root.handlers = [handler]
+        root.setLevel(level.upper() if isinstance(level, str) else level)
+        for name, logger_level in (levels or {}).items():
+            logging.getLogger(name.strip()).setLevel(logger_level.strip().upper())
+
+        _listener = QueueListener(handler.queue, stream, respect_handler_level=True)
+        _listener.start()
+        atexit.register(_listener.stop)
@@ -0,0 +1,131 @@
+import threading
+
+# Minimal Prometheus text-format metrics; enough for counters, gauges and
+# histograms without pulling in a client library
+
+PHASE_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    pairs = []
+    for name, value in labels:
+        escaped = str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        pairs.append(f'{name}="{escaped}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Metric:
+    type = None
+
+    def __init__(self, name, documentation, registry=None):
+        self.name = name
+        self.documentation = documentation
+        self._lock = threading.Lock()
+        (registry or REGISTRY).register(self)
+
+    def header(self):
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}"]
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def __init__(self, name, documentation, registry=None):
+        super().__init__(name, documentation, registry)
+        self._values = {}
+
+    def inc(self, amount=1, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            return [(self.name, key, value) for key, value in self._values.items()]
+
+
+class Gauge(Metric):
+    type = "gauge"
+
+    def __init__(self, name, documentation, collect, registry=None):
+        # collect() returns a number, or a list of (labels dict, value) pairs
+        super().__init__(name, documentation, registry)
+        self._collect = collect
+
+    def samples(self):
+        value = self._collect()
+        if isinstance(value, (int, float)):
+            return [(self.name, (), value)]
+        return [(self.name, tuple(sorted(labels.items())), sample) for labels, sample in value]
+
+
+class CallbackCounter(Gauge):
+    # A counter whose current totals are read from somewhere else at scrape time
+    type = "counter"
+
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(self, name, documentation, buckets=PHASE_BUCKETS, registry=None):
+        super().__init__(name, documentation, registry)
+        self.buckets = tuple(buckets) + (float("inf"),)
+        self._values = {}
+
+    def observe(self, value, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = {"buckets": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    entry["buckets"][index] += 1
+            entry["sum"] += value
+            entry["count"] += 1
+
+    def samples(self):
+        samples = []
+        with self._lock:
+            for key, entry in self._values.items():
+                for bound, count in zip(self.buckets, entry["buckets"]):
+                    samples.append((f"{self.name}_bucket", key + (("le", _format_value(bound)),), count))
+                samples.append((f"{self.name}_sum", key, entry["sum"]))
+                samples.append((f"{self.name}_count", key, entry["count"]))
+        return samples
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            self._metrics.append(metric)
+
+    def render(self):
+        lines = []
+        with self._lock:
+            metrics = list(self._metrics)
+        for metric in metrics:
+            lines.extend(metric.header())
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+JOBS = Counter("instaautomation_jobs_total", "Automation jobs by outcome, counted per target in a batch")
+PHASE_DURATION = Histogram("instaautomation_phase_duration_seconds", "Wall time of each automation phase")
@@ -0,0 +1,152 @@
+import hashlib
+import logging
+import threading
+
+from flask import Flask, Response, jsonify, redirect, render_template, request
+from werkzeug.serving import make_server
+
+logger = logging.getLogger(__name__)
+
+SESSION_COOKIE = "sessionid"
+PAGE_SIZE = 12
+
+# Usernames starting with these prefixes get the matching profile variant
+PRIVATE_PREFIX = "private"
+EMPTY_PREFIX = "empty"
+MISSING_PREFIX = "missing"
+
+
+def post_codes(username, count):
+    return [hashlib.md5(f"{username}:{index}".encode("utf-8")).hexdigest()[:11] for index in range(count)]
+
+
+def create_app(password="password", posts_per_profile=24, liked_every=4, image_kb=150):
+    app = Flask(__name__)
+    app.config["MOCK_PASSWORD"] = password
+    state = {"likes": set(), "lock": threading.Lock()}
+
+    def logged_in():
+        return request.cookies.get(SESSION_COOKIE) is not None
+
+    def is_liked(code):
+        # About one post in liked_every starts out liked so already-liked handling can be exercised
+        digest = hashlib.md5(code.encode("utf-8")).hexdigest()
+        preliked = bool(liked_every) and int(digest, 16) % liked_every == 0
+        return preliked != (code in state["likes"])
+
+    def profile_posts(username):
+        if username.startswith(EMPTY_PREFIX):
+            return []
+        return post_codes(username, posts_per_profile)
+
+    @app.route("/robots.txt")
+    def robots():
+        return Response("User-agent: *\nDisallow:\n", mimetype="text/plain")
+
+    @app.route("/accounts/login/", methods=["GET", "POST"])
+    def login():
+        error = None
+        if request.method == "POST":
+            username = request.form.get("username", "")
+            if username and request.form.get("password") == app.config["MOCK_PASSWORD"]:
+                response = redirect("/")
+                response.set_cookie(SESSION_COOKIE, hashlib.sha1(username.encode("utf-8")).hexdigest())
+                return response
+            error = "Sorry, your password was incorrect. Please double-check your password."
+        return render_template("login.html", error=error)
+
+    @app.route("/")
+    def home():
+        if not logged_in():
+            return redirect("/accounts/login/")
+        return render_template("home.html")
+
+    @app.route("/<username>/")
+    def profile(username):
+        if not logged_in():
+            return redirect("/accounts/login/")
+        if username.startswith(MISSING_PREFIX):
+            return render_template("not_found.html"), 404
+
+        private = username.startswith(PRIVATE_PREFIX)
+        codes = [] if private else profile_posts(username)
+        return render_template(
+            "profile.html",
+            username=username,
+            private=private,
+            post_count=len(codes),
+            posts=codes[:PAGE_SIZE],
+            has_more=len(codes) > PAGE_SIZE,
+        )
+
+    @app.route("/api/<username>/posts")
+    def more_posts(username):
+        offset = request.args.get("offset", 0, type=int)
+        codes = profile_posts(username)
+        return jsonify({
+            "posts": codes[offset:offset + PAGE_SIZE],
+            "has_more": len(codes) > offset + PAGE_SIZE,
+        })
+
+    @app.route("/p/<code>/")
+    @app.route("/<username>/p/<code>/")
+    def post(code, username=None):
+        if not logged_in():
+            return redirect("/accounts/login/")
+        return render_template("post.html", code=code, liked=is_liked(code))
+
+    @app.route("/api/like/<code>", methods=["POST"])
+    def toggle_like(code):
+        with state["lock"]:
+            if code in state["likes"]:
+                state["likes"].discard(code)
+            else:
+                state["likes"].add(code)
+        return jsonify({"liked": is_liked(code)})
+
+    @app.route("/media/<code>.svg")
+    def media(code):
+        # Padded so image downloads cost roughly what a real thumbnail does
+        color = "#" + hashlib.md5(code.encode("utf-8")).hexdigest()[:6]
+        padding = "<!--" + "x" * (image_kb * 1024) + "-->"
+        body = (
+            '<svg xmlns="http://www.w3.org/2000/svg" width="640" height="640">'
+            f'<rect width="640" height="640" fill="{color}"/>{padding}</svg>'
+        )
+        return Response(body, mimetype="image/svg+xml")
+
+    @app.route("/__state")
+    def dump_state():
+        # Posts whose like state was changed by the client since the last reset
+        return jsonify({"toggled": sorted(state["likes"])})
+
+    @app.route("/__reset", methods=["POST"])
+    def reset():
+        with state["lock"]:
+            state["likes"].clear()
+        return jsonify({"status": "ok"})
+
+    return app
+
+
+class MockServer:
+    def __init__(self, app, host="127.0.0.1", port=0):
+        self.app = app
+        self._server = make_server(host, port, app, threaded=True)
+        self.base_url = f"http://{host}:{self._server.server_port}"
+        self._thread = threading.Thread(target=self._server.serve_forever, name="mock-instagram", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        logger.info("Mock Instagram running at %s", self.base_url)
+        return self
+
+    def reset(self):
+        self.app.test_client().post("/__reset")
+
+    def stop(self):
+        self._server.shutdown()
+
+
+def start_mock_server(port=0, **options):
+    return MockServer(create_app(**options), port=port).start()
@@ -0,0 +1,23 @@
+import argparse
+import logging
+
+from mock_instagram import create_app
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+parser = argparse.ArgumentParser(description="Local Instagram stand-in for exercising the automation")
+parser.add_argument("--host", default="127.0.0.1")
+parser.add_argument("--port", type=int, default=8800)
+parser.add_argument("--password", default="password", help="Password accepted for every username")
+parser.add_argument("--posts", type=int, default=24, help="Posts on each public profile")
+parser.add_argument("--liked-every", type=int, default=4, help="Roughly one post in N starts out liked (0 for none)")
+parser.add_argument("--image-kb", type=int, default=150, help="Size of each served image")
+args = parser.parse_args()
+
+app = create_app(
+    password=args.password,
+    posts_per_profile=args.posts,
+    liked_every=args.liked_every,
+    image_kb=args.image_kb,
+)
+app.run(host=args.host, port=args.port, threaded=True)
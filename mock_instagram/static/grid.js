@@ -0,0 +1,44 @@
+// Loads the next page of posts when the user scrolls near the bottom, after a
+// short delay to stand in for the network round trip
+(function () {
+    var grid = document.getElementById('grid');
+    if (!grid) {
+        return;
+    }
+    var loading = false;
+
+    function appendPosts(posts) {
+        var username = grid.dataset.username;
+        posts.forEach(function (code) {
+            var item = document.createElement('div');
+            item.className = '_aabd';
+            item.innerHTML = '<a href="/' + username + '/p/' + code + '/" role="link">' +
+                '<div class="_aagv"><img src="/media/' + code + '.svg" alt="Photo by ' + username + '"></div>' +
+                '<div class="_aagw"></div></a>';
+            grid.appendChild(item);
+        });
+    }
+
+    function loadMore() {
+        if (loading || grid.dataset.hasMore !== 'true') {
+            return;
+        }
+        if (window.innerHeight + window.scrollY < document.body.scrollHeight - 200) {
+            return;
+        }
+        loading = true;
+        var offset = parseInt(grid.dataset.offset, 10);
+        fetch('/api/' + grid.dataset.username + '/posts?offset=' + offset)
+            .then(function (response) { return response.json(); })
+            .then(function (data) {
+                setTimeout(function () {
+                    appendPosts(data.posts);
+                    grid.dataset.offset = offset + data.posts.length;
+                    grid.dataset.hasMore = data.has_more ? 'true' : 'false';
+                    loading = false;
+                }, 300);
+            });
+    }
+
+    window.addEventListener('scroll', loadMore);
+})();
@@ -0,0 +1,19 @@
+// Toggles the like state the way Instagram does: the button and its icon swap
+// between "Like" and "Unlike" once the server acknowledges the change
+(function () {
+    var button = document.getElementById('likeButton');
+    var article = document.querySelector('article');
+    if (!button || !article) {
+        return;
+    }
+
+    button.addEventListener('click', function () {
+        fetch('/api/like/' + article.dataset.code, {method: 'POST'})
+            .then(function (response) { return response.json(); })
+            .then(function (data) {
+                var label = data.liked ? 'Unlike' : 'Like';
+                button.setAttribute('aria-label', label);
+                button.querySelector('svg').setAttribute('aria-label', label);
+            });
+    });
+})();
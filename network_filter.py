@@ -0,0 +1,206 @@
+import fnmatch
+import json
+import logging
+import os
+import tempfile
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Network.setBlockedURLs wildcard patterns for assets the automation never looks at
+BLOCK_CATEGORIES = {
+    "images": ["*.jpg*", "*.jpeg*", "*.png*", "*.gif*", "*.webp*", "*.heic*", "*/media/*.svg*"],
+    "media": ["*.mp4*", "*.m4a*", "*.m4v*", "*.webm*", "*.m3u8*", "*.mpd*"],
+    "fonts": ["*.woff*", "*.ttf*", "*.otf*"],
+    "analytics": [
+        "*google-analytics.com*",
+        "*googletagmanager.com*",
+        "*doubleclick.net*",
+        "*connect.facebook.net*",
+        "*facebook.com/tr*",
+        "*/logging_client_events*",
+        "*/ajax/bz*",
+    ],
+}
+
+# Requests Chrome refused because of Network.setBlockedURLs
+BLOCKED_REASON = "inspector"
+
+
+def build_block_list(categories, extra=(), allow=()):
+    # Any pattern that would also block an allow-listed URL is dropped, since
+    # setBlockedURLs has no way to express exceptions
+    patterns = []
+    for category in categories:
+        if category not in BLOCK_CATEGORIES:
+            logger.warning("Unknown network block category: %s", category)
+            continue
+        patterns.extend(BLOCK_CATEGORIES[category])
+    patterns.extend(extra)
+
+    blocked = []
+    for pattern in dict.fromkeys(patterns):
+        allowed = [url for url in allow if fnmatch.fnmatchcase(url, pattern)]
+        if allowed:
+            logger.warning("Not blocking %s: it matches allow-listed %s", pattern, allowed[0])
+            continue
+        blocked.append(pattern)
+    return blocked
+
+
+def apply_network_blocking(driver, patterns):
+    if not patterns:
+        return False
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+        logger.info("Blocking %s URL patterns", len(patterns))
+        return True
+    except Exception as e:
+        logger.warning("Could not enable network blocking: %s", e)
+        return False
+
+
+def drain_performance_log(driver):
+    # Chrome's performance log holds the Network.* events since the last drain
+    try:
+        return driver.get_log("performance")
+    except Exception as e:
+        logger.warning("Could not read the performance log: %s", e)
+        return []
+
+
+# Starting point for the typical size of a request per CDP resource type, used until
+# downloads of that type have been seen. Blocked types are never downloaded while
+# blocking is on, so these only move when blocking is off (e.g. benchmark.py
+# --network-blocking both), and the learned values are persisted for later runs.
+DEFAULT_TYPICAL_BYTES = {
+    "Image": 40000,
+    "Media": 500000,
+    "Font": 30000,
+    "Script": 20000,
+    "XHR": 2000,
+    "Fetch": 2000,
+    "Ping": 500,
+    "Other": 2000,
+}
+
+
+class TypicalSizes:
+    # Decaying average encoded size of downloaded requests per resource type
+    def __init__(self, path=None, decay=0.8, defaults=DEFAULT_TYPICAL_BYTES):
+        self.path = path
+        self.decay = decay
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._sizes = dict(defaults)
+        self._sizes.update(self._load())
+
+    def _load(self):
+        if not self.path:
+            return {}
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return {key: float(value) for key, value in data.items() if isinstance(value, (int, float))}
+
+    def record(self, resource_type, size):
+        with self._lock:
+            typical = self._sizes.get(resource_type)
+            self._sizes[resource_type] = float(size) if typical is None else \
+                typical * self.decay + size * (1 - self.decay)
+            self._dirty = True
+
+    def get(self, resource_type):
+        with self._lock:
+            return self._sizes.get(resource_type)
+
+    def save(self):
+        if not self.path:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            data = json.dumps(self._sizes, indent=2)
+            self._dirty = False
+
+        directory = os.path.dirname(self.path) or "."
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(fd, "w") as f:
+                f.write(data)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning("Could not save network baseline: %s", e)
+
+
+def _parse(entries):
+    requests = {}
+    for entry in entries:
+        try:
+            message = json.loads(entry["message"])["message"]
+        except (KeyError, TypeError, ValueError):
+            continue
+        method = message.get("method")
+        params = message.get("params", {})
+        request_id = params.get("requestId")
+
+        if method == "Network.requestWillBeSent":
+            page = (params.get("documentURL") or "").split("?")[0]
+            if not page.startswith("http"):
+                continue
+            requests.setdefault(request_id, {
+                "page": page,
+                "type": params.get("type", "Other"),
+                "bytes": 0,
+                "finished": False,
+                "blocked": False,
+            })
+        elif method == "Network.loadingFinished" and request_id in requests:
+            requests[request_id]["bytes"] = params.get("encodedDataLength", 0)
+            requests[request_id]["finished"] = True
+        elif method == "Network.loadingFailed" and request_id in requests:
+            requests[request_id]["blocked"] = params.get("blockedReason") == BLOCKED_REASON
+    return requests.values()
+
+
+def summarize_network(entries, sizes):
+    # Per page: requests made, bytes downloaded, requests blocked, and an estimate of
+    # the bytes the blocked requests would have downloaded. No time saving is
+    # reported: requests load in parallel, so their durations do not add up to
+    # wall time; benchmark.py --network-blocking both measures that directly.
+    pages = {}
+    blocked = []
+    for request in _parse(entries):
+        page = pages.setdefault(request["page"], {
+            "page": request["page"],
+            "requests": 0,
+            "bytes": 0,
+            "blocked": 0,
+            "estimated_saved_bytes": 0,
+            "unestimated": 0,
+        })
+        if request["blocked"]:
+            page["blocked"] += 1
+            blocked.append((page, request))
+            continue
+        page["requests"] += 1
+        page["bytes"] += request["bytes"]
+        if request["finished"]:
+            sizes.record(request["type"], request["bytes"])
+
+    for page, request in blocked:
+        typical = sizes.get(request["type"])
+        if typical is None:
+            page["unestimated"] += 1
+            continue
+        page["estimated_saved_bytes"] += int(typical)
+
+    totals = {
+        field: sum(page[field] for page in pages.values())
+        for field in ("requests", "bytes", "blocked", "estimated_saved_bytes", "unestimated")
+    }
+    return {"pages": list(pages.values()), "totals": totals}
@@ -0,0 +1,132 @@
+import logging
+
+from tracing import phase
+
+logger = logging.getLogger(__name__)
+
+POST_PATH_MARKERS = ("/p/", "/reel/")
+
+# Returns every post and reel link on the page, deduplicated and in grid order,
+# so discovery costs one round trip and never touches stale element handles
+COLLECT_POSTS_SCRIPT = """
+var seen = {};
+var posts = [];
+var links = document.querySelectorAll("a[href*='/p/'], a[href*='/reel/']");
+for (var i = 0; i < links.length; i++) {
+    var url = links[i].href.split('#')[0].split('?')[0];
+    if (!/\\/(p|reel)\\/[^\\/]+\\/?$/.test(url) || seen[url]) {
+        continue;
+    }
+    seen[url] = true;
+    var rect = links[i].getBoundingClientRect();
+    posts.push({
+        url: url,
+        top: Math.round(rect.top + window.scrollY),
+        left: Math.round(rect.left + window.scrollX)
+    });
+}
+posts.sort(function (a, b) { return a.top - b.top || a.left - b.left; });
+var rowTop = null;
+var row = -1;
+var column = 0;
+for (var j = 0; j < posts.length; j++) {
+    if (posts[j].top !== rowTop) {
+        rowTop = posts[j].top;
+        row += 1;
+        column = 0;
+    }
+    posts[j].index = j;
+    posts[j].row = row;
+    posts[j].column = column++;
+}
+return posts;
+"""
+
+
+def is_post_url(url):
+    return bool(url) and any(marker in url for marker in POST_PATH_MARKERS)
+
+
+def collect_post_urls(driver):
+    try:
+        with phase("discover"):
+            posts = driver.execute_script(COLLECT_POSTS_SCRIPT) or []
+    except Exception as e:
+        logger.warning("Error collecting post links: %s", e)
+        return []
+
+    logger.debug("Collected %s post links in one probe", len(posts))
+    return posts
+
+
+# Scrolls to the bottom and resolves as soon as the grid grows (page height or
+# number of post links), or with grew=false once the timeout passes
+SCROLL_AND_WAIT_SCRIPT = """
+var timeoutMs = arguments[0];
+var callback = arguments[arguments.length - 1];
+var selector = "a[href*='/p/'], a[href*='/reel/']";
+var startHeight = document.body.scrollHeight;
+var startLinks = document.querySelectorAll(selector).length;
+var done = false;
+var observer = null;
+var timer = null;
+function finish(grew) {
+    if (done) {
+        return;
+    }
+    done = true;
+    if (observer) {
+        observer.disconnect();
+    }
+    clearTimeout(timer);
+    callback({grew: grew, height: document.body.scrollHeight});
+}
+function grown() {
+    return document.body.scrollHeight > startHeight || document.querySelectorAll(selector).length > startLinks;
+}
+observer = new MutationObserver(function () {
+    if (grown()) {
+        finish(true);
+    }
+});
+observer.observe(document.body, {childList: true, subtree: true, attributes: true, attributeFilter: ['href']});
+timer = setTimeout(function () { finish(grown()); }, timeoutMs);
+window.scrollTo(0, document.body.scrollHeight);
+"""
+
+
+def scroll_and_wait_for_growth(driver, timeout=5):
+    try:
+        with phase("scroll"):
+            result = driver.execute_async_script(SCROLL_AND_WAIT_SCRIPT, int(timeout * 1000))
+    except Exception as e:
+        logger.warning("Error waiting for the grid to grow: %s", e)
+        return False
+    return bool(result and result.get("grew"))
+
+
+def harvest_post_urls(driver, max_posts=10, max_scrolls=20, growth_timeout=5, idle_rounds=1):
+    # Yields posts as they appear and stops scrolling as soon as enough have been
+    # seen or the grid stops growing
+    seen = set()
+    idle = 0
+    for scroll in range(max_scrolls + 1):
+        new_posts = [post for post in collect_post_urls(driver) if post["url"] not in seen]
+        for post in new_posts:
+            seen.add(post["url"])
+            yield post
+            if len(seen) >= max_posts:
+                logger.info("Harvested %s posts after %s scrolls", len(seen), scroll)
+                return
+
+        if scroll == max_scrolls:
+            break
+
+        if scroll_and_wait_for_growth(driver, growth_timeout):
+            idle = 0
+        else:
+            idle += 1
+            if idle >= idle_rounds:
+                break
+
+    logger.info("Grid stopped growing; harvested %s posts after %s scrolls", len(seen), scroll)
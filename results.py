@@ -0,0 +1,72 @@
+# Outcome of one target profile, from most to least successful
+OK = "ok"                                  # every post processed was liked or already liked
+PARTIAL = "partial"                        # some posts failed or a budget cut the run short
+NO_POSTS = "no_posts"                      # the profile has no posts to like
+PRIVATE = "private"                        # the profile is private
+PROFILE_NOT_FOUND = "profile_not_found"    # the username does not exist
+AUTH_FAILED = "auth_failed"                # the credentials were rejected
+ERROR = "error"                            # the browser, network or page broke in an unexpected way
+SKIPPED = "skipped"                        # the batch job ran out of budget before reaching it
+
+OUTCOMES = (OK, PARTIAL, NO_POSTS, PRIVATE, PROFILE_NOT_FOUND, AUTH_FAILED, ERROR, SKIPPED)
+
+# Outcomes a scheduler can expect to change by running the same request again;
+# the rest need different input, so retrying them only burns a Chrome session
+RETRYABLE = (PARTIAL, ERROR, SKIPPED)
+
+MESSAGES = {
+    OK: "Successfully liked {liked} posts on {target}'s profile!",
+    PARTIAL: "Liked {liked} posts on {target}'s profile; {failed} failed and {skipped} were skipped.",
+    NO_POSTS: "{target}'s profile has no posts to like.",
+    PRIVATE: "{target}'s profile is private.",
+    PROFILE_NOT_FOUND: "Profile {target} does not exist.",
+    AUTH_FAILED: "Failed to login to Instagram. Please check your credentials.",
+    ERROR: "An error occurred: {error}",
+    SKIPPED: "{target} was not processed: {stop_reason} exhausted.",
+}
+
+
+class TargetResult:
+    # What happened on one target profile: the outcome code, per-post counts,
+    # the wall time of each phase and whether running it again could help
+    def __init__(self, target_username, outcome=ERROR, error=None):
+        self.target_username = target_username
+        self.outcome = outcome
+        self.error = error
+        self.posts_found = 0
+        self.liked = 0
+        self.skipped = 0
+        self.failed = 0
+        self.stop_reason = None
+        self.phases = {}
+        self.seconds = None
+
+    @property
+    def retryable(self):
+        return self.outcome in RETRYABLE
+
+    @property
+    def message(self):
+        return MESSAGES[self.outcome].format(
+            target=self.target_username, liked=self.liked, failed=self.failed,
+            skipped=self.skipped, error=self.error, stop_reason=self.stop_reason,
+        )
+
+    def to_dict(self):
+        return {
+            "target_username": self.target_username,
+            "outcome": self.outcome,
+            "retryable": self.retryable,
+            "message": self.message,
+            "posts_found": self.posts_found,
+            "liked": self.liked,
+            "skipped": self.skipped,
+            "failed": self.failed,
+            "stop_reason": self.stop_reason,
+            "phases": self.phases,
+            "seconds": self.seconds,
+            "error": self.error,
+        }
+
+    def __repr__(self):
+        return f"TargetResult({self.target_username!r}, {self.outcome!r}, liked={self.liked})"
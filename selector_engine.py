@@ -0,0 +1,201 @@
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import namedtuple
+
+from waits import wait_until
+
+logger = logging.getLogger(__name__)
+
+Locator = namedtuple("Locator", ["name", "xpath", "priority"])
+
+# Evaluates the XPaths in order inside the page and returns the index of the
+# first one that matches together with its elements, in a single round trip
+PROBE_SCRIPT = """
+var xpaths = arguments[0];
+var root = arguments[1] || document;
+var firstOnly = arguments[2];
+for (var i = 0; i < xpaths.length; i++) {
+    var result;
+    try {
+        result = document.evaluate(xpaths[i], root, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    } catch (e) {
+        continue;
+    }
+    if (result.snapshotLength) {
+        var count = firstOnly ? 1 : result.snapshotLength;
+        var nodes = [];
+        for (var j = 0; j < count; j++) {
+            nodes.push(result.snapshotItem(j));
+        }
+        return [i, nodes];
+    }
+}
+return null;
+"""
+
+
+class Scoreboard:
+    # Decaying hit rate and latency per strategy, kept per page type and engine
+    def __init__(self, path=None, decay=0.8, save_interval=30, default_score=0.5):
+        self.path = path
+        self.decay = decay
+        self.save_interval = save_interval
+        self.default_score = default_score
+        self._lock = threading.Lock()
+        self._last_saved = time.time()
+        self._dirty = False
+        self._scores = self._load()
+
+    def _load(self):
+        if not self.path:
+            return {}
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _entry(self, page_type, engine, strategy):
+        strategies = self._scores.setdefault(page_type, {}).setdefault(engine, {})
+        return strategies.setdefault(strategy, {
+            "score": self.default_score,
+            "hits": 0,
+            "misses": 0,
+            "latency_ms": None,
+        })
+
+    def score(self, page_type, engine, strategy):
+        with self._lock:
+            entry = self._scores.get(page_type, {}).get(engine, {}).get(strategy)
+            return entry["score"] if entry else self.default_score
+
+    def record(self, page_type, engine, missed, hit=None, latency=None):
+        with self._lock:
+            for strategy in missed:
+                entry = self._entry(page_type, engine, strategy)
+                entry["score"] = entry["score"] * self.decay
+                entry["misses"] += 1
+            if hit:
+                entry = self._entry(page_type, engine, hit)
+                entry["score"] = entry["score"] * self.decay + (1 - self.decay)
+                entry["hits"] += 1
+                if latency is not None:
+                    latency_ms = latency * 1000
+                    previous = entry["latency_ms"]
+                    entry["latency_ms"] = round(
+                        latency_ms if previous is None else previous * self.decay + latency_ms * (1 - self.decay), 1
+                    )
+            self._dirty = True
+            due = time.time() - self._last_saved >= self.save_interval
+
+        if due:
+            self.save()
+
+    def snapshot(self):
+        with self._lock:
+            return json.loads(json.dumps(self._scores))
+
+    def save(self):
+        if not self.path:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            data = json.dumps(self._scores, indent=2)
+            self._dirty = False
+            self._last_saved = time.time()
+
+        directory = os.path.dirname(self.path) or "."
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(fd, "w") as f:
+                f.write(data)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning("Could not save selector scoreboard: %s", e)
+
+
+class Match:
+    def __init__(self, locator, elements):
+        self.locator = locator
+        self.elements = elements
+
+    @property
+    def element(self):
+        return self.elements[0]
+
+
+class SelectorEngine:
+    # Locators are tried in their declared order, which runs from precise to broad.
+    # The scoreboard only demotes a locator whose score has decayed below
+    # demote_below (about eight misses in a row with no hit) to the end of the list,
+    # and every explore_every-th probe runs the declared order unchanged so a demoted
+    # locator can earn its place back.
+    def __init__(self, name, locators, page_type=None, scoreboard=None, demote_below=0.1, explore_every=20):
+        self.name = name
+        self.page_type = page_type or name
+        self.scoreboard = scoreboard
+        self.demote_below = demote_below
+        self.explore_every = explore_every
+        self._probes = 0
+        # Plain (name, xpath) pairs get priorities from their position in the list
+        self.locators = sorted(
+            (
+                locator if isinstance(locator, Locator) else Locator(locator[0], locator[1], index)
+                for index, locator in enumerate(locators)
+            ),
+            key=lambda locator: locator.priority,
+        )
+
+    def ordered_locators(self):
+        if not self.scoreboard:
+            return list(self.locators)
+        self._probes += 1
+        if self.explore_every and self._probes % self.explore_every == 0:
+            return list(self.locators)
+        # Stable sort: demoted locators move to the end, everything else keeps its priority
+        return sorted(
+            self.locators,
+            key=lambda locator: self.scoreboard.score(self.page_type, self.name, locator.name) < self.demote_below,
+        )
+
+    def probe(self, driver, root=None, first_only=False, record_misses=True):
+        locators = self.ordered_locators()
+        started = time.time()
+        result = driver.execute_script(
+            PROBE_SCRIPT, [locator.xpath for locator in locators], root, first_only
+        )
+        latency = time.time() - started
+        if not result:
+            if self.scoreboard and record_misses:
+                self.scoreboard.record(self.page_type, self.name, [locator.name for locator in locators])
+            return None
+
+        index, elements = result
+        locator = locators[index]
+        if self.scoreboard:
+            self.scoreboard.record(
+                self.page_type, self.name, [missed.name for missed in locators[:index]], locator.name, latency
+            )
+        logger.debug("[%s] matched %s element(s) with strategy: %s", self.name, len(elements), locator.name)
+        return Match(locator, elements)
+
+    def wait(self, driver, timeout, root=None, first_only=True, poll_frequency=0.25):
+        # One shared deadline for every strategy instead of a timeout per strategy.
+        # Empty polls while the page renders are not counted against the strategies.
+        match = wait_until(
+            driver,
+            lambda d: self.probe(d, root=root, first_only=first_only, record_misses=False),
+            timeout,
+            poll_frequency=poll_frequency,
+        )
+        if match is None:
+            if self.scoreboard:
+                self.scoreboard.record(self.page_type, self.name, [locator.name for locator in self.locators])
+            logger.debug("[%s] no strategy matched within %s seconds", self.name, timeout)
+        return match
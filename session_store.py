@@ -0,0 +1,155 @@
+import hashlib
+import hmac
+import json
+import logging
+import os
+import tempfile
+import time
+
+from cryptography.fernet import Fernet, InvalidToken
+
+logger = logging.getLogger(__name__)
+
+# Cookie fields accepted by driver.add_cookie
+COOKIE_FIELDS = ("name", "value", "path", "domain", "secure", "httpOnly", "expiry", "sameSite")
+
+PASSWORD_HASH_ITERATIONS = 100000
+
+
+def _password_digest(password, salt):
+    return hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, PASSWORD_HASH_ITERATIONS).hex()
+
+
+def load_or_create_key(key_path, store_dir=None):
+    # Generate a key on first use and keep it readable by the owner only
+    if store_dir and _inside(key_path, store_dir):
+        logger.warning(
+            "Session key %s is stored inside the session directory %s; anyone who can read "
+            "the sessions can decrypt them. Set SESSION_KEY_PATH elsewhere or SESSION_ENCRYPTION_KEY.",
+            key_path, store_dir,
+        )
+    if os.path.exists(key_path):
+        with open(key_path, "rb") as f:
+            return f.read().strip()
+
+    os.makedirs(os.path.dirname(key_path) or ".", exist_ok=True)
+    key = Fernet.generate_key()
+    fd = os.open(key_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, "wb") as f:
+        f.write(key)
+    logger.info("Created session encryption key at %s", key_path)
+    return key
+
+
+def _inside(path, directory):
+    path = os.path.realpath(path)
+    directory = os.path.realpath(directory)
+    return os.path.commonpath([path, directory]) == directory
+
+
+class SessionStore:
+    def __init__(self, directory, key, max_age_seconds=30 * 24 * 3600):
+        self.directory = directory
+        self.max_age_seconds = max_age_seconds
+        self._fernet = Fernet(key)
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, username):
+        # Account names are hashed so the directory listing does not leak them
+        digest = hashlib.sha256(username.lower().encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"{digest}.session")
+
+    def save(self, username, password, driver):
+        try:
+            cookies = [
+                {field: cookie[field] for field in COOKIE_FIELDS if field in cookie}
+                for cookie in driver.get_cookies()
+            ]
+            local_storage = driver.execute_script("return Object.assign({}, window.localStorage);") or {}
+        except Exception as e:
+            logger.warning("Could not read session from browser: %s", e)
+            return False
+
+        # The password digest stops a stored session being reused with the wrong credentials
+        salt = os.urandom(16)
+        payload = json.dumps({
+            "saved_at": time.time(),
+            "salt": salt.hex(),
+            "password_digest": _password_digest(password, salt),
+            "cookies": cookies,
+            "local_storage": local_storage,
+        }).encode("utf-8")
+
+        path = self._path(username)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(self._fernet.encrypt(payload))
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning("Could not write session file: %s", e)
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return False
+
+        logger.info("Saved session with %s cookies", len(cookies))
+        return True
+
+    def load(self, username, password):
+        path = self._path(username)
+        try:
+            with open(path, "rb") as f:
+                data = json.loads(self._fernet.decrypt(f.read()))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, InvalidToken) as e:
+            logger.warning("Discarding unreadable session file: %s", e)
+            self.delete(username)
+            return None
+
+        expected = _password_digest(password, bytes.fromhex(data.get("salt", "")))
+        if not hmac.compare_digest(expected, data.get("password_digest", "")):
+            logger.info("Stored session does not match the supplied credentials")
+            return None
+
+        if time.time() - data.get("saved_at", 0) > self.max_age_seconds:
+            logger.info("Stored session has expired")
+            self.delete(username)
+            return None
+        return data
+
+    def restore(self, username, password, driver, origin_url):
+        data = self.load(username, password)
+        if not data:
+            return False
+
+        try:
+            # Cookies and localStorage can only be set while on the site's origin;
+            # robots.txt is the cheapest page there
+            driver.get(origin_url.rstrip("/") + "/robots.txt")
+            for cookie in data["cookies"]:
+                if cookie.get("sameSite") not in (None, "Strict", "Lax", "None"):
+                    cookie.pop("sameSite")
+                try:
+                    driver.add_cookie(cookie)
+                except Exception as e:
+                    logger.warning("Could not restore cookie %s: %s", cookie.get('name'), e)
+            driver.execute_script(
+                "var items = arguments[0];"
+                "for (var key in items) { window.localStorage.setItem(key, items[key]); }",
+                data["local_storage"],
+            )
+        except Exception as e:
+            logger.warning("Could not restore session: %s", e)
+            return False
+
+        logger.info("Restored session with %s cookies", len(data['cookies']))
+        return True
+
+    def delete(self, username):
+        try:
+            os.remove(self._path(username))
+        except OSError:
+            pass
@@ -0,0 +1,14 @@
+import os
+import sys
+
+# Keep test runs away from the real browser, pacing and the user's cache directory
+os.environ.setdefault("DRIVER_POOL_SIZE", "0")
+os.environ.setdefault("SESSION_STORE_ENABLED", "false")
+os.environ.setdefault("PACING_ENABLED", "false")
+os.environ.setdefault("NETWORK_REPORT", "false")
+os.environ.setdefault("DEBUG_ARTIFACTS", "off")
+os.environ.setdefault("LOG_LEVEL", "CRITICAL")
+os.environ.setdefault("SELECTOR_SCOREBOARD_PATH", "")
+os.environ.setdefault("NETWORK_BASELINE_PATH", "")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
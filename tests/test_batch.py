@@ -0,0 +1,92 @@
+import pytest
+
+import app
+import automation
+import config
+from results import OK, SKIPPED, TargetResult
+
+
+@pytest.mark.parametrize("value, expected", [
+    (None, []),
+    ("", []),
+    ("alice, @bob\ncarol alice", ["alice", "bob", "carol"]),
+    (["alice", " @bob ", "", "alice"], ["alice", "bob"]),
+])
+def test_parse_targets(value, expected):
+    assert app.parse_targets(value) == expected
+
+
+@pytest.mark.parametrize("value", [5, {"alice": 1}, ["alice", 3], True])
+def test_parse_targets_rejects_other_types(value):
+    with pytest.raises(ValueError):
+        app.parse_targets(value)
+
+
+@pytest.fixture
+def client():
+    return app.app.test_client()
+
+
+@pytest.mark.parametrize("body", [
+    {"your_username": "u", "your_password": "p", "target_usernames": 5},
+    {"your_username": "u", "your_password": "p", "target_usernames": {"alice": 1}},
+    {"your_username": "u", "your_password": "p", "target_username": 7},
+    ["alice"],
+])
+def test_start_rejects_malformed_json(client, body):
+    response = client.post("/start", json=body)
+    assert response.status_code == 400
+    assert response.get_json()["status"] == "error"
+
+
+def test_start_rejects_oversized_batch(client, monkeypatch):
+    monkeypatch.setattr(config, "MAX_TARGETS_PER_BATCH", 2)
+    response = client.post("/start", json={
+        "your_username": "u", "your_password": "p", "target_usernames": ["a", "b", "c"],
+    })
+    assert response.status_code == 400
+
+
+class FakeDriver:
+    def quit(self):
+        pass
+
+
+@pytest.fixture
+def fake_session(monkeypatch):
+    monkeypatch.setattr(automation, "setup_driver", lambda *args: FakeDriver())
+    monkeypatch.setattr(automation, "login_to_instagram", lambda *args: True)
+
+
+def test_batch_reports_every_target_in_order(fake_session, monkeypatch):
+    budgets = []
+
+    def process_target(driver, target_username, budget):
+        budgets.append(budget)
+        return TargetResult(target_username, OK)
+
+    monkeypatch.setattr(automation, "process_target", process_target)
+    reported = []
+    results = automation.start_batch_automation("u", "p", ["a", "b"], on_result=reported.append)
+
+    assert [result.target_username for result in results] == ["a", "b"]
+    assert reported == results
+    # Every target runs under a child of the one job-wide budget
+    assert budgets[0].parent is budgets[1].parent
+    assert budgets[0].parent.name == "job"
+
+
+def test_batch_skips_targets_once_the_job_budget_is_spent(fake_session, monkeypatch):
+    monkeypatch.setattr(config, "JOB_TIME_BUDGET_SECONDS", 10)
+
+    def process_target(driver, target_username, budget):
+        # Spend the whole job's budget on the first target
+        budget.parent.started -= 100
+        return TargetResult(target_username, OK)
+
+    monkeypatch.setattr(automation, "process_target", process_target)
+    results = automation.start_batch_automation("u", "p", ["a", "b", "c"])
+
+    assert [result.outcome for result in results] == [OK, SKIPPED, SKIPPED]
+    assert results[1].stop_reason == "job_time_budget"
+    assert results[1].retryable
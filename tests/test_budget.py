@@ -0,0 +1,66 @@
+import pytest
+
+import like_engine
+from like_engine import Budget
+from tracing import begin_trace
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(like_engine.time, "time", clock)
+    return clock
+
+
+def test_unlimited_budget_never_runs_out(clock):
+    budget = Budget("job", 0, None)
+    clock.now += 10 ** 6
+    assert budget.exhausted() is None
+    assert budget.remaining_seconds() is None
+    assert budget.cap(5) == 5
+
+
+def test_time_budget_runs_out(clock):
+    budget = Budget("post", 30)
+    clock.now += 29
+    assert budget.exhausted() is None
+    assert budget.cap(5) == pytest.approx(1)
+    clock.now += 1
+    assert budget.exhausted() == "post_time_budget"
+    assert budget.cap(5) == 0
+
+
+def test_command_budget_counts_from_creation(clock):
+    trace = begin_trace()
+    trace.command_count = 50
+    budget = Budget("post", commands=10)
+    trace.command_count = 59
+    assert budget.exhausted() is None
+    trace.command_count = 60
+    assert budget.exhausted() == "post_command_budget"
+
+
+def test_child_is_exhausted_by_its_parent(clock):
+    job = Budget("job", 60)
+    clock.now += 50
+    post = Budget("post", 30, parent=job)
+    # The parent's remaining 10 seconds cap the child's 30
+    assert post.cap(20) == pytest.approx(10)
+    clock.now += 10
+    assert post.exhausted() == "job_time_budget"
+
+
+def test_child_running_out_leaves_the_parent(clock):
+    job = Budget("job", 600)
+    post = Budget("post", 30, parent=job)
+    clock.now += 30
+    assert post.exhausted() == "post_time_budget"
+    assert job.exhausted() is None
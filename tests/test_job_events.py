@@ -0,0 +1,66 @@
+import threading
+
+import job_events
+from job_events import EventLog
+
+
+def test_events_get_increasing_ids():
+    log = EventLog()
+    first = log.emit("phase", name="login")
+    second = log.emit("post", status="liked")
+    assert (first["id"], second["id"]) == (1, 2)
+    assert second["data"] == {"status": "liked"}
+
+
+def test_read_resumes_after_last_seen_id():
+    log = EventLog()
+    for index in range(3):
+        log.emit("post", index=index)
+    events, closed = log.read(after=1, timeout=0)
+    assert [event["id"] for event in events] == [2, 3]
+    assert not closed
+
+
+def test_read_times_out_with_no_new_events():
+    log = EventLog()
+    log.emit("post")
+    assert log.read(after=1, timeout=0.01) == ([], False)
+
+
+def test_read_wakes_up_on_emit_from_another_thread():
+    log = EventLog()
+    timer = threading.Timer(0.05, log.emit, args=("done",))
+    timer.start()
+    events, closed = log.read(after=0, timeout=5)
+    timer.join()
+    assert [event["event"] for event in events] == ["done"]
+
+
+def test_close_ends_readers_and_ignores_later_emits():
+    log = EventLog()
+    log.emit("post")
+    log.close()
+    assert log.emit("post") is None
+    events, closed = log.read(after=1, timeout=5)
+    assert events == []
+    assert closed
+
+
+def test_oldest_events_are_dropped_past_the_limit():
+    log = EventLog(max_events=2)
+    for index in range(4):
+        log.emit("post", index=index)
+    events, _ = log.read(after=0, timeout=0)
+    assert [event["id"] for event in events] == [3, 4]
+
+
+def test_module_emit_goes_to_the_bound_log():
+    log = EventLog()
+    job_events.emit("ignored")
+    with job_events.bind_events(log):
+        with job_events.stage("login"):
+            pass
+    events, _ = log.read(after=0, timeout=0)
+    assert [(event["event"], event["data"]["status"]) for event in events] == [
+        ("phase", "started"), ("phase", "finished"),
+    ]
@@ -0,0 +1,133 @@
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+logger = logging.getLogger(__name__)
+
+
+class Span:
+    def __init__(self, name, parent=None):
+        self.name = name
+        self.parent = parent
+        self.started = time.time()
+        self.duration = None
+        self.commands = 0
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "seconds": round(self.duration, 4) if self.duration is not None else None,
+            "commands": self.commands,
+        }
+
+
+class JobTrace:
+    # Wall time and WebDriver command counts for each phase of one job
+    def __init__(self):
+        self.spans = []
+        self.current = None
+        self.commands = {}
+        self.command_count = 0
+        self.network = None
+
+    def start(self, name):
+        span = Span(name, parent=self.current)
+        self.current = span
+        return span
+
+    def end(self, span):
+        span.duration = time.time() - span.started
+        self.spans.append(span)
+        if self.current is span:
+            self.current = span.parent
+
+    def count_command(self, count=1):
+        # Commands are attributed to the innermost open phase only
+        if self.current:
+            self.current.commands += count
+
+    def record_command(self, command, caller, seconds, error=None):
+        self.count_command()
+        self.command_count += 1
+        entry = self.commands.get((command, caller))
+        if entry is None:
+            entry = self.commands[(command, caller)] = {"count": 0, "errors": 0, "seconds": 0.0}
+        entry["count"] += 1
+        entry["seconds"] += seconds
+        if error:
+            entry["errors"] += 1
+
+    def command_summary(self, top=10):
+        # Totals plus the callers that spent the most time in WebDriver round trips
+        entries = [
+            {"command": command, "caller": caller, "count": entry["count"],
+             "errors": entry["errors"], "seconds": round(entry["seconds"], 4)}
+            for (command, caller), entry in self.commands.items()
+        ]
+        entries.sort(key=lambda entry: entry["seconds"], reverse=True)
+        return {
+            "total_commands": sum(entry["count"] for entry in entries),
+            "total_seconds": round(sum(entry["seconds"] for entry in entries), 4),
+            "errors": sum(entry["errors"] for entry in entries),
+            "top_callers": entries[:top],
+        }
+
+    def phase_totals(self, since=0):
+        # since: index into spans, to total only the phases that ended after that point
+        totals = {}
+        for span in self.spans[since:]:
+            entry = totals.setdefault(span.name, {"seconds": 0.0, "count": 0, "commands": 0})
+            entry["seconds"] += span.duration
+            entry["count"] += 1
+            entry["commands"] += span.commands
+        for entry in totals.values():
+            entry["seconds"] = round(entry["seconds"], 4)
+        return totals
+
+    def to_dict(self):
+        return {
+            "phases": self.phase_totals(),
+            "spans": [span.to_dict() for span in self.spans],
+            "commands": self.command_summary(),
+            "network": self.network,
+        }
+
+
+_current_trace = ContextVar("job_trace", default=None)
+
+
+def begin_trace():
+    trace = JobTrace()
+    _current_trace.set(trace)
+    return trace
+
+
+def current_trace():
+    return _current_trace.get()
+
+
+def start_phase(name):
+    trace = current_trace()
+    return trace.start(name) if trace else None
+
+
+def end_phase(span):
+    trace = current_trace()
+    if trace and span:
+        trace.end(span)
+
+
+@contextmanager
+def phase(name):
+    span = start_phase(name)
+    try:
+        yield span
+    finally:
+        end_phase(span)
+
+
+def count_command(count=1):
+    trace = current_trace()
+    if trace:
+        trace.count_command(count)
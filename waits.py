@@ -0,0 +1,104 @@
+import logging
+import random
+import time
+from contextvars import ContextVar
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+logger = logging.getLogger(__name__)
+
+# Deliberate pauses between actions, in seconds, before scaling
+DEFAULT_PACING = {
+    "typing": (0.5, 1.5),
+    "between_posts": (2, 3),
+    "between_targets": (5, 10),
+}
+
+
+class WaitStats:
+    # Wall clock spent waiting on page readiness versus deliberate pacing
+    def __init__(self):
+        self.readiness_seconds = 0.0
+        self.readiness_waits = 0
+        self.readiness_timeouts = 0
+        self.pacing_seconds = 0.0
+        self.pacing_pauses = 0
+
+    def to_dict(self):
+        return {
+            "readiness_seconds": round(self.readiness_seconds, 3),
+            "readiness_waits": self.readiness_waits,
+            "readiness_timeouts": self.readiness_timeouts,
+            "pacing_seconds": round(self.pacing_seconds, 3),
+            "pacing_pauses": self.pacing_pauses,
+        }
+
+
+_current_stats = ContextVar("wait_stats", default=None)
+
+
+def begin_wait_stats():
+    stats = WaitStats()
+    _current_stats.set(stats)
+    return stats
+
+
+def current_wait_stats():
+    return _current_stats.get()
+
+
+class PacingPolicy:
+    def __init__(self, enabled=True, scale=1.0, ranges=None):
+        self.enabled = enabled
+        self.scale = scale
+        self.ranges = dict(DEFAULT_PACING)
+        self.ranges.update(ranges or {})
+
+    def pause(self, action):
+        if not self.enabled or action not in self.ranges:
+            return 0
+        min_seconds, max_seconds = self.ranges[action]
+        sleep_time = random.uniform(min_seconds, max_seconds) * self.scale
+        logger.debug("Pacing '%s' for %.2f seconds", action, sleep_time)
+        time.sleep(sleep_time)
+
+        stats = current_wait_stats()
+        if stats:
+            stats.pacing_seconds += sleep_time
+            stats.pacing_pauses += 1
+        return sleep_time
+
+
+def wait_until(driver, condition, timeout, poll_frequency=0.25):
+    # Returns the condition's value, or None if it did not hold within the timeout
+    started = time.time()
+    try:
+        return WebDriverWait(driver, timeout, poll_frequency=poll_frequency).until(condition)
+    except TimeoutException:
+        stats = current_wait_stats()
+        if stats:
+            stats.readiness_timeouts += 1
+        return None
+    finally:
+        stats = current_wait_stats()
+        if stats:
+            stats.readiness_seconds += time.time() - started
+            stats.readiness_waits += 1
+
+
+def document_ready(driver):
+    return driver.execute_script("return document.readyState;") == "complete"
+
+
+def wait_for_page(driver, timeout=15):
+    return wait_until(driver, document_ready, timeout) is not None
+
+
+def wait_for_presence(driver, locator, timeout=10):
+    return wait_until(driver, EC.presence_of_element_located(locator), timeout)
+
+
+def wait_for_url_change(driver, previous_url, timeout=10):
+    return wait_until(driver, EC.url_changes(previous_url), timeout) is not None